@@ -1,6 +1,24 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.core.checks import Tags, register
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
 
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from api.core.metrics import install_query_counter
+        from api.users.tokens import (
+            check_denylist_cache, revoke_sessions_of_inactive_user
+        )
+        from users.models import User
+        connection_created.connect(install_query_counter)
+        register(check_denylist_cache, Tags.caches)
+        post_save.connect(revoke_sessions_of_inactive_user, sender=User)
+        post_delete.connect(revoke_sessions_of_inactive_user, sender=User)
+        if settings.SLOW_QUERY_LOG_ENABLED:
+            from api.core.querylog import install_slow_query_logger
+            connection_created.connect(install_slow_query_logger)
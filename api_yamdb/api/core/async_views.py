@@ -0,0 +1,47 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import HttpResponseNotAllowed
+
+READ_METHODS = ('GET', 'HEAD')
+
+# Ограниченный пул потоков для работы с ORM: число одновременных
+# подключений к БД не растёт вместе с числом открытых соединений клиентов.
+_orm_executor = ThreadPoolExecutor(
+    max_workers=settings.ASYNC_ORM_MAX_WORKERS,
+    thread_name_prefix='async-orm'
+)
+
+
+def _read(view, request, kwargs):
+    """Выполняет синхронное представление ViewSet в пуле потоков.
+
+    Аутентификация, права, ограничение частоты, выбор реплики, обработка
+    ошибок и рендеринг — те же, что у синхронного эндпоинта, поэтому
+    ответы совпадают побайтно. Ответ рендерится здесь же, чтобы
+    сериализация не занимала поток цикла событий.
+    """
+    close_old_connections()
+    try:
+        return view(request, **kwargs).render()
+    finally:
+        close_old_connections()
+
+
+_read_async = sync_to_async(
+    _read, thread_sensitive=False, executor=_orm_executor
+)
+
+
+def async_read_view(viewset_class, action):
+    """Асинхронный обработчик действия list или retrieve для ViewSet."""
+    sync_view = viewset_class.as_view({'get': action})
+
+    async def view(request, **kwargs):
+        if request.method not in READ_METHODS:
+            return HttpResponseNotAllowed(READ_METHODS)
+        return await _read_async(sync_view, request, kwargs)
+
+    return view
@@ -0,0 +1,15 @@
+def execute_wrapper_installer(wrapper_class):
+    """Обработчик connection_created для постоянной обёртки запросов.
+
+    Подключает к каждому новому соединению один экземпляр wrapper_class.
+    Обработчик нужно сохранить в переменной модуля: сигнал держит на него
+    только слабую ссылку.
+    """
+
+    def install(sender, connection, **kwargs):
+        wrappers = connection.execute_wrappers
+        if not any(isinstance(wrapper, wrapper_class) for wrapper in wrappers):
+            # Вставляем в начало: временные обёртки снимаются через pop().
+            wrappers.insert(0, wrapper_class())
+
+    return install
@@ -0,0 +1,143 @@
+import threading
+from collections import defaultdict, deque
+from contextvars import ContextVar
+from time import perf_counter
+
+from django.conf import settings
+
+from api.core.connections import execute_wrapper_installer
+
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+def percentile(values, fraction):
+    """Процентиль методом ближайшего ранга по отсортированным значениям."""
+    if not values:
+        return 0
+    index = min(len(values) - 1, int(round(fraction * (len(values) - 1))))
+    return values[index]
+
+
+class QueryCollector:
+    """Обёртка execute_wrapper: считает запросы, их время и повторы."""
+
+    def __init__(self):
+        self.count = 0
+        self.duplicates = 0
+        self.duration = 0.0
+        self._seen = set()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += perf_counter() - started
+            self.count += 1
+            key = (sql, repr(params))
+            if key in self._seen:
+                self.duplicates += 1
+            else:
+                self._seen.add(key)
+
+
+# Сборщик обрабатываемого HTTP-запроса; выставляется
+# RequestMetricsMiddleware. Переменная контекста переходит вместе с
+# запросом в потоки sync_to_async и пула async-orm.
+current_collector = ContextVar('current_collector', default=None)
+
+
+class RequestQueryCounter:
+    """Постоянная обёртка соединения: передаёт запросы сборщику запроса.
+
+    Подключается к каждому соединению при его открытии, поэтому запросы
+    считаются в любом потоке, где выполняется код HTTP-запроса.
+    """
+
+    def __call__(self, execute, sql, params, many, context):
+        collector = current_collector.get()
+        if collector is None:
+            return execute(sql, params, many, context)
+        return collector(execute, sql, params, many, context)
+
+
+# Обработчик connection_created: подключает RequestQueryCounter.
+install_query_counter = execute_wrapper_installer(RequestQueryCounter)
+
+
+class _ViewStats:
+
+    def __init__(self, sample_size):
+        self.count = 0
+        self.wall_sum = 0.0
+        self.db_sum = 0.0
+        self.queries_sum = 0
+        self.duplicates_sum = 0
+        self.wall = deque(maxlen=sample_size)
+        self.db = deque(maxlen=sample_size)
+        self.queries = deque(maxlen=sample_size)
+
+
+class MetricsRegistry:
+    """Агрегирует метрики запросов по view и HTTP-методу в памяти процесса."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = defaultdict(
+            lambda: _ViewStats(settings.METRICS_SAMPLE_SIZE)
+        )
+
+    def observe(self, view, method, wall, db, queries, duplicates):
+        with self._lock:
+            stats = self._views[(view, method)]
+            stats.count += 1
+            stats.wall_sum += wall
+            stats.db_sum += db
+            stats.queries_sum += queries
+            stats.duplicates_sum += duplicates
+            stats.wall.append(wall)
+            stats.db.append(db)
+            stats.queries.append(queries)
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+    def render_prometheus(self):
+        """Возвращает метрики в текстовом формате Prometheus."""
+        snapshot = {}
+        with self._lock:
+            for (view, method), stats in sorted(self._views.items()):
+                snapshot[f'view="{view}",method="{method}"'] = (
+                    stats.count, stats.wall_sum, stats.db_sum,
+                    stats.queries_sum, stats.duplicates_sum,
+                    sorted(stats.wall), sorted(stats.db),
+                    sorted(stats.queries),
+                )
+        lines = []
+        summaries = (
+            ('yamdb_request_duration_seconds', 'Request wall time.', 1, 5),
+            ('yamdb_db_duration_seconds', 'Database time per request.',
+             2, 6),
+            ('yamdb_db_queries', 'SQL queries per request.', 3, 7),
+        )
+        for name, help_text, sum_index, samples_index in summaries:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} summary')
+            for labels, row in snapshot.items():
+                for quantile in QUANTILES:
+                    value = percentile(row[samples_index], quantile)
+                    lines.append(
+                        f'{name}{{{labels},quantile="{quantile}"}} {value}'
+                    )
+                lines.append(f'{name}_sum{{{labels}}} {row[sum_index]}')
+                lines.append(f'{name}_count{{{labels}}} {row[0]}')
+        name = 'yamdb_db_duplicate_queries_total'
+        lines.append(f'# HELP {name} Repeated identical SQL queries.')
+        lines.append(f'# TYPE {name} counter')
+        for labels, row in snapshot.items():
+            lines.append(f'{name}{{{labels}}} {row[4]}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
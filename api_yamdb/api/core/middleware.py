@@ -0,0 +1,86 @@
+import asyncio
+from time import perf_counter
+
+from django.conf import settings
+
+from api.core.metrics import QueryCollector, current_collector, registry
+from api.core.querylog import current_view
+
+UNRESOLVED_VIEW = 'unresolved'
+
+
+def get_view_name(request):
+    """Имя маршрута запроса, например `titles-list` или `reviews-detail`."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None or not match.url_name:
+        return UNRESOLVED_VIEW
+    return match.url_name
+
+
+class RequestMetricsMiddleware:
+    """Замеряет время запроса, время и число SQL-запросов для каждого view.
+
+    Работает и в синхронной, и в асинхронной цепочке: под ASGI Django не
+    оборачивает её в SyncToAsync. Запросы к БД считает RequestQueryCounter
+    того потока, в котором они выполняются.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Как в MiddlewareMixin: экземпляр выглядит корутинной функцией.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        collector = QueryCollector()
+        tokens = self.start(collector)
+        try:
+            started = perf_counter()
+            response = self.get_response(request)
+            wall = perf_counter() - started
+        finally:
+            self.stop(tokens)
+        return self.finish(request, response, wall, collector)
+
+    async def __acall__(self, request):
+        collector = QueryCollector()
+        tokens = self.start(collector)
+        try:
+            started = perf_counter()
+            response = await self.get_response(request)
+            wall = perf_counter() - started
+        finally:
+            self.stop(tokens)
+        return self.finish(request, response, wall, collector)
+
+    @staticmethod
+    def start(collector):
+        return current_view.set(None), current_collector.set(collector)
+
+    @staticmethod
+    def stop(tokens):
+        view_token, collector_token = tokens
+        current_collector.reset(collector_token)
+        current_view.reset(view_token)
+
+    def finish(self, request, response, wall, collector):
+        registry.observe(
+            get_view_name(request), request.method, wall, collector.duration,
+            collector.count, collector.duplicates
+        )
+        if settings.METRICS_SERVER_TIMING:
+            response['Server-Timing'] = (
+                f'app;dur={wall * 1000:.2f}, '
+                f'db;dur={collector.duration * 1000:.2f}, '
+                f'db-queries;desc="{collector.count}", '
+                f'db-duplicates;desc="{collector.duplicates}"'
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        current_view.set(get_view_name(request))
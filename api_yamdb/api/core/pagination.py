@@ -0,0 +1,11 @@
+from rest_framework.pagination import CursorPagination
+
+
+class IdCursorPagination(CursorPagination):
+    """Постраничный вывод по ключу id без COUNT и OFFSET.
+
+    Страница выбирается условием id > последнего id предыдущей
+    страницы, поэтому её стоимость не зависит от номера.
+    """
+
+    ordering = 'id'
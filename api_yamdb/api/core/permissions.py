@@ -1,20 +1,51 @@
 from rest_framework import permissions
+from users.models import ADMIN, MODERATOR
+
+# Флаги ролей пользователя; маска вычисляется один раз на запрос.
+ROLE_ADMIN = 1
+ROLE_MODERATOR = 2
+SUPERUSER = 4
+STAFF = 8
+
+# Доступ к администрированию: роль admin, суперпользователь или staff.
+ADMIN_ACCESS = ROLE_ADMIN | SUPERUSER | STAFF
+# Изменение чужих отзывов и комментариев: роли admin и moderator.
+MODERATION_ACCESS = ROLE_ADMIN | ROLE_MODERATOR
+
+
+def role_mask(request):
+    """Маска ролей пользователя запроса, сохраняется в самом запросе."""
+    mask = getattr(request, '_role_mask', None)
+    if mask is None:
+        user = getattr(request, 'user', None)
+        mask = 0
+        if user is not None and user.is_authenticated:
+            mask = (
+                (user.role == ADMIN and ROLE_ADMIN)
+                | (user.role == MODERATOR and ROLE_MODERATOR)
+                | (user.is_superuser and SUPERUSER)
+                | (user.is_staff and STAFF)
+            )
+        request._role_mask = mask
+    return mask
 
 
 class AdminOnly(permissions.BasePermission):
     """ Класс для проверки, является ли пользователь администратором """
 
     def has_permission(self, request, view):
-        user = getattr(request, 'user', None)
-        if user is None:
-            return False
-        return user.is_authenticated and (user.is_admin or user.is_staff)
+        return bool(role_mask(request) & ADMIN_ACCESS)
 
     def has_object_permission(self, request, view, obj):
-        return (
-            request.user.is_admin
-            or request.user.is_staff
-        )
+        return bool(role_mask(request) & ADMIN_ACCESS)
+
+
+class ModeratorOrAdmin(permissions.BasePermission):
+    """ Класс для проверки, является ли пользователь модератором
+    или администратором """
+
+    def has_permission(self, request, view):
+        return bool(role_mask(request) & MODERATION_ACCESS)
 
 
 class IsAuthorOrModeratorOrAdmin(permissions.BasePermission):
@@ -25,8 +56,9 @@ class IsAuthorOrModeratorOrAdmin(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
         # Для изменения проверяем, является ли пользователь автором,
-        # модератором или администратором
+        # модератором или администратором; автор сравнивается по id,
+        # без загрузки связанного объекта.
         return (
-            obj.author == request.user
-            or request.user.role in ['admin', 'moderator']
+            bool(role_mask(request) & MODERATION_ACCESS)
+            or obj.author_id == request.user.id
         )
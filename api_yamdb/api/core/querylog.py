@@ -0,0 +1,115 @@
+import logging
+import os
+import re
+import threading
+import traceback
+from contextvars import ContextVar
+from pathlib import Path
+from time import perf_counter
+
+from django.conf import settings
+
+from api.core.connections import execute_wrapper_installer
+
+logger = logging.getLogger('api.slow_queries')
+
+# Имя маршрута обрабатываемого запроса; выставляется RequestMetricsMiddleware.
+current_view = ContextVar('current_view', default=None)
+
+API_DIR = str(Path(__file__).resolve().parent.parent) + os.sep
+_SKIP_FILES = (
+    str(Path(__file__).resolve()),
+    str(Path(__file__).resolve().with_name('middleware.py')),
+    str(Path(__file__).resolve().with_name('metrics.py')),
+)
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_RE = re.compile(r'%s')
+_IN_LIST_RE = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+_SPACES_RE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """Нормализует SQL: литералы и параметры заменяются на `?`."""
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    sql = _PLACEHOLDER_RE.sub('?', sql)
+    sql = _IN_LIST_RE.sub('IN (...)', sql)
+    return _SPACES_RE.sub(' ', sql).strip()
+
+
+def api_frame():
+    """Ближайший к запросу кадр стека из кода приложения `api`."""
+    for frame in reversed(traceback.extract_stack()):
+        if frame.filename.startswith(API_DIR) and (
+            frame.filename not in _SKIP_FILES
+        ):
+            return f'{frame.filename}:{frame.lineno} in {frame.name}'
+    return None
+
+
+class FingerprintStats:
+    """Число и суммарное время запросов по каждому отпечатку."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def add(self, key, duration):
+        with self._lock:
+            count, total = self._stats.get(key, (0, 0.0))
+            self._stats[key] = (count + 1, total + duration)
+
+    def top(self, limit):
+        """Отпечатки с наибольшим суммарным временем."""
+        with self._lock:
+            items = list(self._stats.items())
+        items.sort(key=lambda item: item[1][1], reverse=True)
+        return items[:limit]
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def render_prometheus(self, limit):
+        lines = []
+        top = self.top(limit)
+        for name, index, help_text in (
+            ('yamdb_sql_fingerprint_calls_total', 0,
+             'SQL queries by fingerprint.'),
+            ('yamdb_sql_fingerprint_seconds_total', 1,
+             'Cumulative SQL time by fingerprint.'),
+        ):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} counter')
+            for key, values in top:
+                label = key.replace('\\', '\\\\').replace('"', '\\"')
+                lines.append(
+                    f'{name}{{fingerprint="{label}"}} {values[index]}'
+                )
+        return '\n'.join(lines) + '\n'
+
+
+fingerprint_stats = FingerprintStats()
+
+
+class SlowQueryLogger:
+    """Обёртка execute_wrapper: статистика отпечатков и журнал медленных."""
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = perf_counter() - started
+            fingerprint_stats.add(fingerprint(sql), duration)
+            if duration * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+                logger.warning(
+                    'Slow query %.1f ms in %s at %s: %s',
+                    duration * 1000, current_view.get(), api_frame(), sql
+                )
+
+
+# Обработчик connection_created: подключает SlowQueryLogger.
+install_slow_query_logger = execute_wrapper_installer(SlowQueryLogger)
@@ -0,0 +1,111 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+PRIMARY_COOKIE_NAME = 'yamdb_primary'
+
+# Алиас БД, с которой в текущем контексте выполняются запросы на чтение.
+_read_alias = ContextVar('read_alias', default=None)
+
+
+def _primary_cache_key(user_id):
+    return f'replicas:primary:{user_id}'
+
+
+def _get_user(request):
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return None
+    return user
+
+
+def is_pinned_to_primary(request):
+    """Проверяет, писал ли клиент в БД в течение окна read-your-writes."""
+    if request.COOKIES.get(PRIMARY_COOKIE_NAME):
+        return True
+    user = _get_user(request)
+    return (
+        user is not None
+        and cache.get(_primary_cache_key(user.id)) is not None
+    )
+
+
+def pin_to_primary(request, response):
+    """Закрепляет клиента за основной БД после записи."""
+    window = settings.REPLICA_PRIMARY_STICKY_SECONDS
+    response.set_cookie(
+        PRIMARY_COOKIE_NAME, '1', max_age=window, httponly=True
+    )
+    # Клиенты с JWT часто не хранят cookie, поэтому закрепляем и по id.
+    user = _get_user(request)
+    if user is not None:
+        cache.set(_primary_cache_key(user.id), 1, timeout=window)
+
+
+def choose_replica(request):
+    """Возвращает алиас реплики для запроса или None для основной БД."""
+    replicas = settings.READ_REPLICAS
+    if (
+        not replicas
+        or request.method not in SAFE_METHODS
+        or is_pinned_to_primary(request)
+    ):
+        return None
+    return random.choice(replicas)
+
+
+@contextmanager
+def reading_from(alias):
+    """Направляет все чтения внутри блока в БД с указанным алиасом."""
+    token = _read_alias.set(alias)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+class ReplicaRouter:
+    """Роутер, отправляющий чтения в реплику, выбранную для запроса."""
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return None
+
+
+class ReplicaReadMixin:
+    """Миксин для APIView и ViewSet: безопасные запросы читают из реплик.
+
+    После успешной записи клиент закрепляется за основной БД, поэтому
+    миксин нужен и представлениям, которые только пишут.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        # Алиас, выставленный в initial(), сбрасывается здесь, а не в
+        # finalize_response(): DRF не вызывает её, если представление
+        # бросило исключение не из API, и поток воркера читал бы из
+        # реплики во всех следующих запросах.
+        with reading_from(_read_alias.get()):
+            return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        # Реплика выбирается после аутентификации: закрепление за
+        # основной БД проверяется и по id пользователя.
+        super().initial(request, *args, **kwargs)
+        alias = choose_replica(request)
+        if alias is not None:
+            _read_alias.set(alias)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if (
+            settings.READ_REPLICAS
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+        ):
+            pin_to_primary(request, response)
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,94 @@
+import hashlib
+from collections.abc import Mapping
+
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """Ограничение частоты запросов по скользящему окну.
+
+    Для каждого ключа в кэше хранятся два счётчика: за текущее окно
+    длиной duration и за предыдущее. Число запросов за последние
+    duration секунд оценивается как текущий счётчик плюс доля
+    предыдущего, пропорциональная ещё не вышедшей из окна части.
+    Проверка стоит одного get_many и одного incr на ключ независимо
+    от разрешённого числа запросов.
+
+    Ключи — IP клиента и значения полей key_fields из тела запроса:
+    перебор имён с разных адресов и с одного адреса ограничивается
+    одинаково. Отклонённые запросы счётчики не увеличивают.
+    """
+
+    key_fields = ()
+    cache_format = 'throttle:%(scope)s:%(ident)s'
+
+    def get_idents(self, request):
+        idents = [f'ip:{self.get_ident(request)}']
+        data = request.data if isinstance(request.data, Mapping) else {}
+        for field in self.key_fields:
+            value = data.get(field)
+            if isinstance(value, str) and value:
+                # Значение из запроса хешируется: ключ кэша получается
+                # ограниченной длины и без пробелов и управляющих символов.
+                digest = hashlib.sha1(value.lower().encode()).hexdigest()
+                idents.append(f'{field}:{digest}')
+        return idents
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        now = self.timer()
+        window, elapsed = divmod(now, self.duration)
+        window = int(window)
+        keys = [
+            self.cache_format % {'scope': self.scope, 'ident': ident}
+            for ident in self.get_idents(request)
+        ]
+        counters = self.cache.get_many(
+            [f'{key}:{window}' for key in keys]
+            + [f'{key}:{window - 1}' for key in keys]
+        )
+        weight = 1 - elapsed / self.duration
+        for key in keys:
+            current = counters.get(f'{key}:{window}', 0)
+            previous = counters.get(f'{key}:{window - 1}', 0)
+            if current + previous * weight >= self.num_requests:
+                self.wait_time = self.estimate_wait(
+                    current, previous, elapsed
+                )
+                return False
+        for key in keys:
+            self.increment(f'{key}:{window}')
+        return True
+
+    def increment(self, key):
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            # Первый запрос в окне; счётчик живёт, пока нужен следующему.
+            if not self.cache.add(key, 1, timeout=2 * self.duration):
+                self.cache.incr(key)
+
+    def estimate_wait(self, current, previous, elapsed):
+        """Секунды до того, как оценка опустится ниже лимита."""
+        if current < self.num_requests and previous:
+            needed = 1 - (self.num_requests - current) / previous
+            return max(0, self.duration * needed - elapsed)
+        return self.duration - elapsed
+
+    def wait(self):
+        return getattr(self, 'wait_time', None)
+
+
+class SignupThrottle(SlidingWindowThrottle):
+    scope = 'signup'
+    key_fields = ('username', 'email')
+
+
+class TokenThrottle(SlidingWindowThrottle):
+    scope = 'token'
+    key_fields = ('username',)
+
+
+class TokenRefreshThrottle(SlidingWindowThrottle):
+    scope = 'token_refresh'
@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.views import APIView
+
+from api.core.metrics import registry
+from api.core.permissions import AdminOnly
+from api.core.querylog import fingerprint_stats
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class MetricsView(APIView):
+    """Метрики запросов в формате Prometheus (только для администратора)."""
+
+    permission_classes = (AdminOnly,)
+
+    def get(self, request):
+        content = registry.render_prometheus()
+        if settings.SLOW_QUERY_LOG_ENABLED:
+            content += fingerprint_stats.render_prometheus(
+                settings.SLOW_QUERY_TOP_FINGERPRINTS
+            )
+        return HttpResponse(content, content_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,96 @@
+import csv
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+
+from api.users.serializers import UserBulkSerializer
+from api_yamdb.utils import batched
+
+FIELDS = UserBulkSerializer.Meta.fields
+
+
+def read_rows(path, file_format):
+    """Строки файла как словари с полями пользователя.
+
+    CSV — в формате static/data/users.csv (столбец id игнорируется),
+    JSON — список объектов с теми же ключами.
+    """
+    with open(path, encoding='utf-8') as file:
+        if file_format == 'json':
+            rows = json.load(file)
+            if not isinstance(rows, list):
+                raise CommandError('JSON-файл должен содержать список.')
+        else:
+            rows = csv.DictReader(file)
+        for row in rows:
+            yield {
+                field: row[field] for field in FIELDS
+                if row.get(field) not in (None, '')
+            }
+
+
+class Command(BaseCommand):
+    help = (
+        'Импортирует пользователей из CSV или JSON пачками: проверка '
+        'уникальности — один запрос на пачку, вставка — bulk_create.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument(
+            '--format', choices=('csv', 'json'),
+            help='Формат файла; по умолчанию определяется по расширению.'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.is_file():
+            raise CommandError(f'Файл {path} не найден.')
+        if not 0 < options['batch_size'] <= settings.USERS_BULK_MAX_SIZE:
+            raise CommandError(
+                'Размер пачки должен быть от 1 до '
+                f'{settings.USERS_BULK_MAX_SIZE}.'
+            )
+        file_format = options['format'] or (
+            'json' if path.suffix.lower() == '.json' else 'csv'
+        )
+        created = skipped = 0
+        for number, batch in enumerate(batched(
+            read_rows(path, file_format), options['batch_size']
+        )):
+            offset = number * options['batch_size']
+            serializer = UserBulkSerializer(data=batch, many=True)
+            if not serializer.is_valid():
+                # Ошибочные строки пропускаются, остальные проверяются
+                # и вставляются заново.
+                valid = []
+                for index, (row, error) in enumerate(
+                    zip(batch, serializer.errors), start=offset + 1
+                ):
+                    if error:
+                        self.stderr.write(f'row {index}: {error}')
+                    else:
+                        valid.append(row)
+                skipped += len(batch) - len(valid)
+                serializer = UserBulkSerializer(data=valid, many=True)
+                if not valid or not serializer.is_valid():
+                    skipped += len(valid)
+                    continue
+            try:
+                with transaction.atomic():
+                    created += len(serializer.save())
+            except IntegrityError as error:
+                # Имя или email заняты параллельной регистрацией между
+                # проверкой и вставкой: пачка откатывается целиком, при
+                # повторном запуске занятые строки отсеет проверка.
+                self.stderr.write(
+                    f'rows {offset + 1}-{offset + len(batch)}: {error}'
+                )
+                skipped += len(serializer.validated_data)
+        self.stdout.write(
+            f'Пользователей создано: {created}, пропущено: {skipped}'
+        )
@@ -1,5 +1,8 @@
+from django.conf import settings
+from django.db import transaction
 from rest_framework import serializers
-from reviews.models import Review, Comment
+from reviews.models import Review, Comment, Title, TitleScoreStats
+from users.models import User
 from django.core.validators import MaxValueValidator, MinValueValidator
 
 
@@ -19,7 +22,9 @@ class ReviewSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Review
-        fields = ('id', 'text', 'author', 'score', 'pub_date')
+        fields = ('id', 'text', 'author', 'score', 'pub_date',
+                  'comment_count')
+        read_only_fields = ('comment_count',)
 
     def validate_score(self, value):
         if not 1 <= value <= 10:
@@ -33,19 +38,23 @@ class ReviewSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         if not request or not request.user.is_authenticated:
             raise serializers.ValidationError("Требуется авторизация")
+        # Уникальность отзыва обеспечивает ограничение unique_review:
+        # повтор отклоняется при вставке (ReviewViewSet.perform_create).
+        return data
 
-        # Проверка уникальности отзыва только при POST-запросе
-        if request.method == 'POST':
-            title_id = self.context['view'].kwargs.get('title_id')
-            author = request.user
-            if Review.objects.filter(
-                title_id=title_id, author=author
-            ).exists():
-                raise serializers.ValidationError(
-                    {'detail': 'Вы уже оставляли отзыв на это произведение'}
-                )
 
-        return data
+class ReviewStatsSerializer(serializers.ModelSerializer):
+    """Сводная статистика оценок произведения."""
+
+    count = serializers.IntegerField()
+    average = serializers.DecimalField(
+        max_digits=4, decimal_places=2, coerce_to_string=False
+    )
+    histogram = serializers.ListField(child=serializers.IntegerField())
+
+    class Meta:
+        model = TitleScoreStats
+        fields = ('count', 'average', 'histogram')
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -58,3 +67,110 @@ class CommentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Comment
         fields = ('id', 'text', 'author', 'pub_date')
+
+
+class ReviewBulkListSerializer(serializers.ListSerializer):
+    """Пакет отзывов: проверки и вставка выполняются для всего пакета.
+
+    Произведения, авторы и уже существующие пары (произведение, автор)
+    загружаются одним запросом каждые, отзывы вставляются через
+    bulk_create, а рейтинг каждого затронутого произведения
+    пересчитывается один раз.
+    """
+
+    def to_internal_value(self, data):
+        if (isinstance(data, list)
+                and len(data) > settings.REVIEWS_BULK_MAX_SIZE):
+            raise serializers.ValidationError({
+                'non_field_errors': [
+                    'В одном запросе можно передать не больше '
+                    f'{settings.REVIEWS_BULK_MAX_SIZE} отзывов.'
+                ]
+            })
+        items = super().to_internal_value(data)
+        title_ids = set(Title.objects.filter(
+            id__in={item['title'] for item in items}
+        ).values_list('id', flat=True))
+        author_ids = dict(User.objects.filter(
+            username__in={item['author'] for item in items}
+        ).values_list('username', 'id'))
+        taken = set(Review.objects.filter(
+            title_id__in=title_ids, author_id__in=author_ids.values()
+        ).values_list('title_id', 'author_id'))
+
+        errors = []
+        for item in items:
+            error = {}
+            if item['title'] not in title_ids:
+                error['title'] = ['Произведение не найдено.']
+            author_id = author_ids.get(item['author'])
+            if author_id is None:
+                error['author'] = ['Пользователь не найден.']
+            pair = (item['title'], author_id)
+            if not error and pair in taken:
+                error['non_field_errors'] = [
+                    'Пользователь уже оставлял отзыв на это произведение.'
+                ]
+            taken.add(pair)
+            item['title_id'] = item.pop('title')
+            item['author_id'] = author_id
+            del item['author']
+            errors.append(error)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return items
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            reviews = Review.objects.bulk_create(
+                [Review(**item) for item in validated_data]
+            )
+            Title.objects.filter(
+                id__in={item['title_id'] for item in validated_data}
+            ).update_ratings()
+        return reviews
+
+
+class ReviewBulkSerializer(serializers.ModelSerializer):
+    """Отзыв в запросе массового создания от имени указанного автора."""
+
+    title = serializers.IntegerField()
+    author = serializers.CharField(max_length=150)
+    score = serializers.IntegerField(min_value=1, max_value=10)
+
+    class Meta:
+        model = Review
+        fields = ('title', 'author', 'text', 'score')
+        list_serializer_class = ReviewBulkListSerializer
+
+
+class ModerationDeleteSerializer(serializers.Serializer):
+    """Отбор отзывов или комментариев для массового удаления модератором.
+
+    Записи выбираются по автору, по списку id или по обоим условиям сразу.
+    """
+
+    author = serializers.CharField(max_length=150, required=False)
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.REVIEWS_BULK_MAX_SIZE,
+        required=False
+    )
+
+    def validate(self, data):
+        if not data:
+            raise serializers.ValidationError(
+                'Укажите автора (author) или список id (ids).'
+            )
+        return data
+
+    def filter(self, queryset):
+        """Выборка записей, подходящих под условия запроса."""
+        if 'author' in self.validated_data:
+            queryset = queryset.filter(
+                author__username=self.validated_data['author']
+            )
+        if 'ids' in self.validated_data:
+            queryset = queryset.filter(id__in=self.validated_data['ids'])
+        return queryset
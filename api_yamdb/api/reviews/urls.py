@@ -1,6 +1,10 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ReviewViewSet, CommentViewSet
+from api.core.async_views import async_read_view
+from .views import (
+    CommentBulkDeleteView, ReviewBulkCreateView, ReviewBulkDeleteView,
+    ReviewViewSet, CommentViewSet
+)
 
 router = DefaultRouter()
 router.register(
@@ -15,5 +19,41 @@ router.register(
 )
 
 urlpatterns = [
+    path(
+        'reviews/bulk/',
+        ReviewBulkCreateView.as_view(),
+        name='reviews-bulk'
+    ),
+    path(
+        'reviews/bulk/delete/',
+        ReviewBulkDeleteView.as_view(),
+        name='reviews-bulk-delete'
+    ),
+    path(
+        'comments/bulk/delete/',
+        CommentBulkDeleteView.as_view(),
+        name='comments-bulk-delete'
+    ),
+    path(
+        'async/titles/<int:title_id>/reviews/',
+        async_read_view(ReviewViewSet, 'list'),
+        name='reviews-async-list'
+    ),
+    path(
+        'async/titles/<int:title_id>/reviews/<int:pk>/',
+        async_read_view(ReviewViewSet, 'retrieve'),
+        name='reviews-async-detail'
+    ),
+    path(
+        'async/titles/<int:title_id>/reviews/<int:review_id>/comments/',
+        async_read_view(CommentViewSet, 'list'),
+        name='comments-async-list'
+    ),
+    path(
+        'async/titles/<int:title_id>/reviews/<int:review_id>/comments/'
+        '<int:pk>/',
+        async_read_view(CommentViewSet, 'retrieve'),
+        name='comments-async-detail'
+    ),
     path('', include(router.urls)),
 ]
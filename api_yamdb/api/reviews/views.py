@@ -1,14 +1,26 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
 from django.shortcuts import get_object_or_404
-from rest_framework import viewsets
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import (IsAuthenticatedOrReadOnly)
-from reviews.models import Title, Review
-from api.core.permissions import IsAuthorOrModeratorOrAdmin
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from reviews.models import (
+    Comment, Title, Review, TitleScoreStats, defer_aggregate_updates
+)
+from api.core.permissions import (
+    AdminOnly, IsAuthorOrModeratorOrAdmin, ModeratorOrAdmin
+)
+from api.core.replicas import ReplicaReadMixin
 from .serializers import (
-    ReviewSerializer, CommentSerializer
+    ModerationDeleteSerializer, ReviewBulkSerializer, ReviewSerializer,
+    ReviewStatsSerializer, CommentSerializer
 )
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """ViewSet для управления отзывами на произведения."""
 
     http_method_names = ['get', 'post', 'patch', 'delete', 'head', 'options']
@@ -21,16 +33,102 @@ class ReviewViewSet(viewsets.ModelViewSet):
         return get_object_or_404(Title, id=self.kwargs['title_id'])
 
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        return self.get_title().reviews.select_related('author')
 
     def perform_create(self, serializer):
-        serializer.save(
-            author=self.request.user,
-            title=self.get_title()
+        title = self.get_title()
+        try:
+            with transaction.atomic():
+                serializer.save(author=self.request.user, title=title)
+        except IntegrityError:
+            # Вместо проверки exists() перед вставкой: повтор отклоняет
+            # ограничение unique_review, в том числе при гонке запросов.
+            raise ValidationError(
+                {'detail': ['Вы уже оставляли отзыв на это произведение']}
+            )
+
+    def perform_destroy(self, instance):
+        # Отзыв только помечается удалённым: комментарии не удаляются
+        # каскадом, строки убирает команда purge_deleted.
+        instance.soft_delete()
+
+    @action(detail=False, methods=['get'], url_path='stats')
+    def stats(self, request, title_id=None):
+        """Число отзывов, средняя оценка и гистограмма оценок 1–10."""
+        stats = TitleScoreStats.objects.filter(title_id=title_id).first()
+        if stats is None:
+            # Строка статистики появляется с первым отзывом.
+            stats = TitleScoreStats(title=self.get_title())
+        return Response(ReviewStatsSerializer(stats).data)
+
+
+class ReviewBulkCreateView(ReplicaReadMixin, APIView):
+    """Массовое создание отзывов для импорта и партнёров."""
+
+    permission_classes = (AdminOnly,)
+
+    def post(self, request):
+        serializer = ReviewBulkSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        try:
+            reviews = serializer.save()
+        except IntegrityError:
+            # Пара (произведение, автор) занята параллельным запросом
+            # между проверкой и вставкой.
+            return Response(
+                {'detail': 'Часть отзывов уже существует, повторите запрос.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(
+            {'created': len(reviews)}, status=status.HTTP_201_CREATED
         )
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class ModerationBulkDeleteView(ReplicaReadMixin, APIView):
+    """Массовое удаление записей модератором по автору или списку id.
+
+    Записи помечаются удалёнными внутри транзакции, агрегаты
+    пересчитываются после этого по одному разу на затронутый объект.
+    Наследник задаёт model и метод delete_matching(queryset), который
+    возвращает число удалённых записей.
+    """
+
+    http_method_names = ['post', 'options']
+    permission_classes = (ModeratorOrAdmin,)
+    model = None
+
+    def post(self, request):
+        serializer = ModerationDeleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        queryset = serializer.filter(self.model.objects.all())
+        with transaction.atomic():
+            deleted = self.delete_matching(queryset)
+        return Response({'deleted': deleted})
+
+
+class ReviewBulkDeleteView(ModerationBulkDeleteView):
+    """Массовое удаление отзывов вместе с комментариями к ним."""
+
+    model = Review
+
+    def delete_matching(self, queryset):
+        return queryset.soft_delete()
+
+
+class CommentBulkDeleteView(ModerationBulkDeleteView):
+    """Массовое удаление комментариев с пересчётом их числа у отзывов."""
+
+    model = Comment
+
+    def delete_matching(self, queryset):
+        with defer_aggregate_updates() as deferred:
+            deferred.review_ids.update(
+                queryset.order_by().values_list('review_id', flat=True)
+            )
+            return queryset.update(is_deleted=True)
+
+
+class CommentViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """ViewSet для управления комментариями к отзывам."""
 
     http_method_names = ['get', 'post', 'patch', 'delete']
@@ -44,10 +142,23 @@ class CommentViewSet(viewsets.ModelViewSet):
         return get_object_or_404(Review, id=self.kwargs["review_id"])
 
     def get_queryset(self):
-        return self.get_review().comments.all()
+        return self.get_review().comments.select_related('author')
 
     def perform_create(self, serializer):
-        serializer.save(
-            author=self.request.user,
-            review=self.get_review()
+        review = self.get_review()
+        with transaction.atomic():
+            serializer.save(author=self.request.user, review=review)
+            self.shift_comment_count(review.id, 1)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            if instance.soft_delete():
+                self.shift_comment_count(instance.review_id, -1)
+
+    @staticmethod
+    def shift_comment_count(review_id, step):
+        # Счётчик обновляется здесь, а не сигналом: без получателей
+        # сигналов каскадное удаление комментариев идёт одним DELETE.
+        Review.objects.filter(id=review_id).update(
+            comment_count=F('comment_count') + step
         )
@@ -1,7 +1,10 @@
 from rest_framework import serializers
 from datetime import datetime
+from django.utils.encoding import smart_str
 from reviews.models import Category, Genre, Title
 
+RATING_FORMAT_DECIMAL = 'decimal'
+
 
 class CategorySerializer(serializers.ModelSerializer):
     """Сериализатор для работы с категориями произведений."""
@@ -21,17 +24,64 @@ class GenreSerializer(serializers.ModelSerializer):
         lookup_field = 'slug'
 
 
+class SlugManyRelatedField(serializers.ManyRelatedField):
+    """Список слагов, который загружает все объекты одним запросом.
+
+    Стандартное поле с many=True выполняет отдельный запрос на каждый
+    переданный слаг.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        child = self.child_relation
+        for slug in data:
+            if not isinstance(slug, str):
+                child.fail('invalid')
+        objects = {
+            getattr(obj, child.slug_field): obj
+            for obj in child.get_queryset().filter(
+                **{f'{child.slug_field}__in': data}
+            )
+        }
+        for slug in data:
+            if slug not in objects:
+                child.fail(
+                    'does_not_exist', slug_name=child.slug_field,
+                    value=smart_str(slug)
+                )
+        return [objects[slug] for slug in data]
+
+
 class TitleReadSerializer(serializers.ModelSerializer):
     """Сериализатор для чтения данных о произведениях."""
 
     category = CategorySerializer(read_only=True)
     genre = GenreSerializer(many=True, read_only=True)
-    rating = serializers.IntegerField(read_only=True)
+    rating = serializers.SerializerMethodField()
 
     class Meta:
         model = Title
-        fields = ('id', 'name', 'year', 'rating',
-                  'description', 'genre', 'category')
+        fields = ('id', 'name', 'year', 'rating', 'review_count',
+                  'last_review_at', 'description', 'genre', 'category')
+
+    def get_rating(self, title):
+        """Целый рейтинг по умолчанию или точный при ?rating_format=decimal.
+
+        Оба значения считаются из полей самого произведения, без
+        дополнительных запросов.
+        """
+        if not title.review_count:
+            return None
+        request = self.context.get('request')
+        if request and request.query_params.get(
+            'rating_format'
+        ) == RATING_FORMAT_DECIMAL:
+            return title.rating
+        # Целая часть среднего, как в прежнем целочисленном рейтинге.
+        return title.score_sum // title.review_count
 
 
 class TitleWriteSerializer(serializers.ModelSerializer):
@@ -43,10 +93,11 @@ class TitleWriteSerializer(serializers.ModelSerializer):
         required=False,
         allow_null=True
     )
-    genre = serializers.SlugRelatedField(
-        slug_field='slug',
-        queryset=Genre.objects.all(),
-        many=True
+    genre = SlugManyRelatedField(
+        child_relation=serializers.SlugRelatedField(
+            slug_field='slug',
+            queryset=Genre.objects.all()
+        )
     )
 
     class Meta:
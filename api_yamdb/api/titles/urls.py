@@ -1,5 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from api.core.async_views import async_read_view
 from .views import TitleViewSet, CategoryViewSet, GenreViewSet
 
 router = DefaultRouter()
@@ -8,5 +9,15 @@ router.register('categories', CategoryViewSet, basename='categories')
 router.register('genres', GenreViewSet, basename='genres')
 
 urlpatterns = [
+    path(
+        'async/titles/',
+        async_read_view(TitleViewSet, 'list'),
+        name='titles-async-list'
+    ),
+    path(
+        'async/titles/<int:pk>/',
+        async_read_view(TitleViewSet, 'retrieve'),
+        name='titles-async-detail'
+    ),
     path('', include(router.urls)),
 ]
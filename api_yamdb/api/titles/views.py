@@ -4,8 +4,9 @@ from rest_framework.response import Response
 from rest_framework.parsers import (
     JSONParser, FormParser, MultiPartParser
 )
-from reviews.models import Title, Category, Genre
+from reviews.models import Title, Category, Genre, defer_aggregate_updates
 from api.core.permissions import AdminOnly
+from api.core.replicas import ReplicaReadMixin
 from rest_framework.permissions import AllowAny
 from .serializers import (
     TitleReadSerializer, TitleWriteSerializer,
@@ -14,16 +15,21 @@ from .serializers import (
 from .filters import TitleFilter
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """ViewSet для управления произведениями."""
 
-    queryset = Title.objects.all()
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre')
     filter_backends = [
         django_filters.DjangoFilterBackend,
-        filters.SearchFilter
+        filters.SearchFilter,
+        filters.OrderingFilter
     ]
     filterset_class = TitleFilter
     search_fields = ['name', 'year', 'category__slug', 'genre__slug']
+    # Поля с индексами: сортировка по активности без агрегации.
+    ordering_fields = ['review_count', 'last_review_at']
     http_method_names = ['get', 'post', 'patch', 'delete', 'head', 'options']
 
     def get_serializer_class(self):
@@ -36,8 +42,13 @@ class TitleViewSet(viewsets.ModelViewSet):
             return [AdminOnly()]
         return [permissions.AllowAny()]
 
+    def perform_destroy(self, instance):
+        with defer_aggregate_updates():
+            instance.delete()
 
-class CategoryViewSet(mixins.ListModelMixin,
+
+class CategoryViewSet(ReplicaReadMixin,
+                      mixins.ListModelMixin,
                       mixins.CreateModelMixin,
                       mixins.DestroyModelMixin,
                       mixins.UpdateModelMixin,
@@ -58,7 +69,8 @@ class CategoryViewSet(mixins.ListModelMixin,
         return [permissions.AllowAny()]
 
 
-class GenreViewSet(mixins.ListModelMixin,
+class GenreViewSet(ReplicaReadMixin,
+                   mixins.ListModelMixin,
                    mixins.CreateModelMixin,
                    mixins.DestroyModelMixin,
                    viewsets.GenericViewSet):
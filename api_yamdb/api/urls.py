@@ -1,7 +1,9 @@
 from django.urls import include, path
 
+from api.core.views import MetricsView
 
 urlpatterns = [
+    path('_metrics', MetricsView.as_view(), name='metrics'),
     path('', include('api.users.urls')),
     path('', include('api.titles.urls')),
     path('', include('api.reviews.urls')),
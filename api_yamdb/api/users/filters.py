@@ -0,0 +1,34 @@
+from django_filters import rest_framework as filters
+from users.models import User
+
+
+def prefix_range(prefix):
+    """Границы [prefix, upper) строк, начинающихся с prefix.
+
+    Сравнение по диапазону использует обычный B-tree индекс, в отличие
+    от LIKE 'prefix%', который SQLite без учёта регистра по индексу
+    не выполняет.
+    """
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class UserFilter(filters.FilterSet):
+    """Поиск пользователей по началу username без учёта регистра
+    и по началу email."""
+
+    username = filters.CharFilter(method='filter_username')
+    email = filters.CharFilter(method='filter_email')
+
+    class Meta:
+        model = User
+        fields = ['username', 'email']
+
+    def filter_username(self, queryset, name, value):
+        lower, upper = prefix_range(value.lower())
+        return queryset.filter(
+            username_lower__gte=lower, username_lower__lt=upper
+        )
+
+    def filter_email(self, queryset, name, value):
+        lower, upper = prefix_range(value)
+        return queryset.filter(email__gte=lower, email__lt=upper)
@@ -1,6 +1,10 @@
+from django.conf import settings
 from rest_framework import serializers
-from users.models import User
+from users.models import ROLE_CHOICES, User
+from users.validators import RESERVED_USERNAMES
 from django.contrib.auth.tokens import default_token_generator
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from django.core.validators import RegexValidator
 from typing import Any, Dict
 
@@ -27,17 +31,24 @@ class SignUpSerializer(serializers.ModelSerializer):
         }
 
     def validate_username(self, value):
-        # Запрещаем использовать 'me' в качестве имени пользователя
-        if value.lower() == 'me':
+        # Запрещаем имена, совпадающие с путями эндпоинтов users/
+        if value.lower() in RESERVED_USERNAMES:
             raise serializers.ValidationError(
-                'Использовать имя "me" в качестве username запрещено!'
+                f'Использовать имя "{value}" в качестве username запрещено!'
             )
         return value
 
     def create(self, validated_data):
         username = validated_data.get('username')
         email = validated_data.get('email')
-        user = User.objects.filter(username=username).first()
+        # Одним запросом находим и пользователя с этим username,
+        # и владельца этого email, если это разные пользователи.
+        matches = list(User.objects.filter(
+            Q(username=username) | Q(email=email)
+        ).only('id', 'username', 'email', 'password', 'last_login')[:2])
+        user = next(
+            (match for match in matches if match.username == username), None
+        )
 
         # Проверка существующего пользователя
         if user:
@@ -45,18 +56,30 @@ class SignUpSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError({
                     'email': 'Email не совпадает с существующим пользователем.'
                 })
-        else:
-            # Проверка уникальности email для нового пользователя
-            if User.objects.filter(email=email).exists():
-                raise serializers.ValidationError({
-                    'email': 'Этот email используется другим пользователем.'
-                })
-            # Создаем нового пользователя
-            user = User.objects.create(username=username, email=email)
-
-        # Генерация и сохранение кода подтверждения
+            user.confirmation_code = default_token_generator.make_token(user)
+            User.objects.filter(pk=user.pk).update(
+                confirmation_code=user.confirmation_code
+            )
+            return user
+
+        # Проверка уникальности email для нового пользователя
+        if matches:
+            raise serializers.ValidationError({
+                'email': 'Этот email используется другим пользователем.'
+            })
+        # Код подтверждения вычисляется до вставки, чтобы новый
+        # пользователь сохранялся одним INSERT.
+        user = User(username=username, email=email)
         user.confirmation_code = default_token_generator.make_token(user)
-        user.save()
+        try:
+            with transaction.atomic():
+                user.save(force_insert=True)
+        except IntegrityError:
+            # Параллельный запрос успел занять username или email.
+            raise serializers.ValidationError({
+                'username': 'Пользователь с таким username или email '
+                            'уже зарегистрирован.'
+            })
         return user
 
 
@@ -77,6 +100,21 @@ class UsersSerializer(serializers.ModelSerializer):
             fields["role"].read_only = True
         return fields
 
+    def update(self, instance, validated_data):
+        # В базу записываются только изменившиеся поля; если ничего не
+        # изменилось, UPDATE не выполняется.
+        changed = [
+            field for field, value in validated_data.items()
+            if getattr(instance, field) != value
+        ]
+        for field in changed:
+            setattr(instance, field, validated_data[field])
+        if 'username' in changed:
+            changed.append('username_lower')
+        if changed:
+            instance.save(update_fields=changed)
+        return instance
+
 
 class GetTokenSerializer(serializers.ModelSerializer):
     """Сериализатор для получения токена."""
@@ -87,3 +125,91 @@ class GetTokenSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('username', 'confirmation_code')
+
+
+class TokenRefreshSerializer(serializers.Serializer):
+    """Сериализатор refresh-токена для обмена и отзыва."""
+
+    refresh = serializers.CharField(required=True)
+
+
+class UserBulkListSerializer(serializers.ListSerializer):
+    """Пакет пользователей: уникальность проверяется одним запросом
+    на весь пакет, вставка выполняется через bulk_create."""
+
+    def to_internal_value(self, data):
+        if (isinstance(data, list)
+                and len(data) > settings.USERS_BULK_MAX_SIZE):
+            raise serializers.ValidationError({
+                'non_field_errors': [
+                    'В одном запросе можно передать не больше '
+                    f'{settings.USERS_BULK_MAX_SIZE} пользователей.'
+                ]
+            })
+        items = super().to_internal_value(data)
+        taken_usernames, taken_emails = set(), set()
+        for username, email in User.objects.filter(
+            Q(username__in={item['username'] for item in items})
+            | Q(email__in={item['email'] for item in items})
+        ).values_list('username', 'email'):
+            taken_usernames.add(username)
+            taken_emails.add(email)
+
+        errors = []
+        for item in items:
+            error = {}
+            if item['username'] in taken_usernames:
+                error['username'] = [
+                    'Пользователь с таким именем уже зарегистрирован.'
+                ]
+            if item['email'] in taken_emails:
+                error['email'] = [
+                    'Этот email используется другим пользователем.'
+                ]
+            taken_usernames.add(item['username'])
+            taken_emails.add(item['email'])
+            errors.append(error)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return items
+
+    def create(self, validated_data):
+        # Без кода подтверждения: иначе остался бы общий для всех код по
+        # умолчанию и токен получил бы любой, кто знает username. Код
+        # выдаёт регистрация на /auth/signup/ с тем же username и email.
+        return User.objects.bulk_create([
+            User(**item, confirmation_code=None) for item in validated_data
+        ])
+
+
+class UserBulkSerializer(serializers.ModelSerializer):
+    """Пользователь в запросе массового создания."""
+
+    class Meta:
+        model = User
+        fields = (
+            'username', 'email', 'first_name',
+            'last_name', 'role', 'bio'
+        )
+        # Валидаторы полей модели без UniqueValidator: уникальность
+        # проверяет UserBulkListSerializer сразу для всего пакета.
+        extra_kwargs = {
+            'username': {
+                'validators': User._meta.get_field('username').validators
+            },
+            'email': {
+                'validators': User._meta.get_field('email').validators
+            },
+        }
+        list_serializer_class = UserBulkListSerializer
+
+
+class RoleChangeSerializer(serializers.Serializer):
+    """Сериализатор для массовой смены роли пользователей."""
+
+    usernames = serializers.ListField(
+        child=serializers.CharField(max_length=150),
+        allow_empty=False,
+        max_length=settings.USERS_BULK_MAX_SIZE
+    )
+    role = serializers.ChoiceField(choices=ROLE_CHOICES)
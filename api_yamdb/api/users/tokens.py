@@ -0,0 +1,144 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Error
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models.signals import post_delete
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import aware_utcnow, datetime_to_epoch
+
+# Время входа по коду подтверждения; переносится во все токены сессии.
+ORIG_IAT_CLAIM = 'orig_iat'
+
+
+def _denylist_key(jti):
+    return f'jwt:denied:{jti}'
+
+
+def _user_revoked_key(user_id):
+    return f'jwt:user-revoked:{user_id}'
+
+
+def denylist():
+    """Кэш списка отозванных refresh-токенов.
+
+    Список должен быть общим для всех воркеров, иначе один токен можно
+    обменять в каждом из них. Кэш в памяти процесса допускается только
+    при DEBUG.
+    """
+    cache = caches[settings.JWT_DENYLIST_CACHE]
+    if isinstance(cache, (LocMemCache, DummyCache)) and not settings.DEBUG:
+        raise ImproperlyConfigured(
+            'Список отозванных токенов хранится в кэше '
+            f'"{settings.JWT_DENYLIST_CACHE}", который не общий для '
+            'воркеров. Укажите в JWT_DENYLIST_CACHE кэш Redis, Memcached '
+            'или файловый (YAMDB_CACHE_DIR).'
+        )
+    return cache
+
+
+def check_denylist_cache(app_configs, **kwargs):
+    """Системная проверка: список отозванных токенов в общем кэше."""
+    try:
+        denylist()
+    except ImproperlyConfigured as error:
+        return [Error(str(error), id='api.E001')]
+    return []
+
+
+def tokens_for(user_id, orig_iat=None):
+    """Пара access- и refresh-токенов для пользователя без загрузки модели.
+
+    Набор claims тот же, что у RefreshToken.for_user(user), плюс время
+    входа orig_iat: ни один токен сессии не действует дольше
+    JWT_SESSION_LIFETIME от этого момента.
+    """
+    refresh = RefreshToken()
+    refresh[jwt_settings.USER_ID_CLAIM] = user_id
+    if orig_iat is None:
+        orig_iat = datetime_to_epoch(refresh.current_time)
+    refresh[ORIG_IAT_CLAIM] = orig_iat
+    session_end = orig_iat + int(
+        settings.JWT_SESSION_LIFETIME.total_seconds()
+    )
+    refresh['exp'] = min(refresh['exp'], session_end)
+    access = refresh.access_token
+    access['exp'] = min(access['exp'], session_end)
+    return access, refresh
+
+
+def _decode(raw_refresh):
+    try:
+        return RefreshToken(raw_refresh)
+    except TokenError as error:
+        raise InvalidToken(error.args[0])
+
+
+def _deny(refresh):
+    """Добавляет токен в список отозванных; False — он уже там."""
+    timeout = max(1, refresh['exp'] - datetime_to_epoch(refresh.current_time))
+    return denylist().add(
+        _denylist_key(refresh[jwt_settings.JTI_CLAIM]), 1, timeout=timeout
+    )
+
+
+def revoke_user_sessions(user_id):
+    """Отзывает все сессии пользователя, начатые до текущего момента.
+
+    Время отзыва хранится в списке отозванных токенов столько же, сколько
+    живёт сессия: более старые refresh-токены уже недействительны.
+    """
+    denylist().set(
+        _user_revoked_key(user_id),
+        datetime_to_epoch(aware_utcnow()),
+        timeout=int(settings.JWT_SESSION_LIFETIME.total_seconds())
+    )
+
+
+def revoke_sessions_of_inactive_user(sender, instance, **kwargs):
+    """Блокировка или удаление пользователя отзывает его сессии."""
+    if kwargs.get('raw'):
+        return
+    if kwargs['signal'] is post_delete or not instance.is_active:
+        revoke_user_sessions(instance.id)
+
+
+def rotate(raw_refresh):
+    """Обменивает refresh-токен на новую пару токенов.
+
+    Обмен не обращается к базе: подпись и срок действия проверяются по
+    самому токену, отзыв — по кэшу. Блокировка и удаление пользователя
+    записывают в кэш время отзыва его сессий, и токены сессий, начатых
+    раньше, не принимаются. Старый refresh-токен попадает в список
+    отозванных до конца своего срока действия; с Redis или Memcached
+    add() атомарно проверяет и пополняет список, поэтому один токен нельзя
+    обменять дважды даже параллельными запросами. Новая пара сохраняет
+    время входа, так что сессия не продлевается бесконечно.
+    """
+    refresh = _decode(raw_refresh)
+    user_id = refresh[jwt_settings.USER_ID_CLAIM]
+    # Токены, выданные до появления orig_iat, считаются выданными при входе.
+    orig_iat = refresh.get(
+        ORIG_IAT_CLAIM,
+        refresh['exp'] - int(
+            jwt_settings.REFRESH_TOKEN_LIFETIME.total_seconds()
+        )
+    )
+    revoked_at = denylist().get(_user_revoked_key(user_id))
+    if revoked_at is not None and orig_iat <= revoked_at:
+        raise InvalidToken('Пользователь не найден или заблокирован.')
+    if not _deny(refresh):
+        raise InvalidToken('Токен уже использован или отозван.')
+    return tokens_for(user_id, orig_iat)
+
+
+def revoke(raw_refresh):
+    """Отзывает refresh-токен, например при выходе из сессии.
+
+    Access-токены сессии не отзываются и действуют до конца своего
+    короткого срока.
+    """
+    _deny(_decode(raw_refresh))
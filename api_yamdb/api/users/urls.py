@@ -1,6 +1,8 @@
 from django.urls import path
 from rest_framework.routers import DefaultRouter
-from .views import UsersViewSet, APISignup, APIGetToken
+from .views import (
+    UsersViewSet, APISignup, APIGetToken, APITokenRefresh, APITokenRevoke
+)
 
 router = DefaultRouter()
 router.register('users', UsersViewSet, basename='users')
@@ -8,4 +10,8 @@ router.register('users', UsersViewSet, basename='users')
 urlpatterns = [
     path('auth/signup/', APISignup.as_view(), name='signup'),
     path('auth/token/', APIGetToken.as_view(), name='get_token'),
+    path('auth/token/refresh/', APITokenRefresh.as_view(),
+         name='token_refresh'),
+    path('auth/token/revoke/', APITokenRevoke.as_view(),
+         name='token_revoke'),
 ] + router.urls
@@ -1,20 +1,30 @@
 from django.core.mail import EmailMessage
-from django.shortcuts import get_object_or_404
+from django.db import IntegrityError
+from django.utils.crypto import constant_time_compare
+from django_filters import rest_framework as django_filters
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.filters import SearchFilter
 from rest_framework.permissions import (IsAuthenticated)
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
+from reviews.models import defer_aggregate_updates
 from users.models import User
+from api.core.pagination import IdCursorPagination
 from api.core.permissions import AdminOnly
+from api.core.replicas import ReplicaReadMixin
+from api.core.throttles import (
+    SignupThrottle, TokenRefreshThrottle, TokenThrottle
+)
+from .filters import UserFilter
 from .serializers import (
-    GetTokenSerializer, SignUpSerializer, UsersSerializer,
+    GetTokenSerializer, RoleChangeSerializer, SignUpSerializer,
+    TokenRefreshSerializer, UserBulkSerializer, UsersSerializer,
 )
+from .tokens import revoke, rotate, tokens_for
 
 
-class UsersViewSet(viewsets.ModelViewSet):
+class UsersViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """ViewSet для управления пользователями."""
 
     http_method_names = ['get', 'post', 'patch', 'delete', 'head', 'options']
@@ -22,8 +32,62 @@ class UsersViewSet(viewsets.ModelViewSet):
     serializer_class = UsersSerializer
     permission_classes = (IsAuthenticated, AdminOnly,)
     lookup_field = 'username'
-    filter_backends = (SearchFilter,)
+    filter_backends = (SearchFilter, django_filters.DjangoFilterBackend)
     search_fields = ('username',)
+    filterset_class = UserFilter
+
+    @property
+    def paginator(self):
+        # Поиск по префиксу и переход по курсору отдают страницы по ключу
+        # id; обычный список сохраняет нумерацию страниц и count. Пустой
+        # параметр (?email=) не фильтрует и страницы не меняет.
+        if not hasattr(self, '_paginator') and any(
+            self.request.query_params.get(param) for param in (
+                *UserFilter.base_filters, IdCursorPagination.cursor_query_param
+            )
+        ):
+            self._paginator = IdCursorPagination()
+        return super().paginator
+
+    def perform_destroy(self, instance):
+        # Каскадно удаляемые отзывы пересчитывают рейтинг каждого
+        # произведения один раз; у отзывов, с которых исчезают
+        # комментарии пользователя, пересчитывается число комментариев.
+        with defer_aggregate_updates() as deferred:
+            deferred.review_ids.update(
+                instance.comments.values_list('review_id', flat=True)
+            )
+            instance.delete()
+
+    @action(methods=['POST'], detail=False, url_path='bulk')
+    def bulk(self, request):
+        """Массовое создание пользователей при переносе из других систем."""
+        serializer = UserBulkSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        try:
+            users = serializer.save()
+        except IntegrityError:
+            # Имя или email заняты параллельным запросом между проверкой
+            # и вставкой.
+            return Response(
+                {'detail': 'Часть пользователей уже существует, '
+                           'повторите запрос.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(
+            {'created': len(users)}, status=status.HTTP_201_CREATED
+        )
+
+    @action(methods=['POST'], detail=False, url_path='bulk/role')
+    def bulk_role(self, request):
+        """Смена роли списка пользователей одним UPDATE."""
+        serializer = RoleChangeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        updated = User.objects.filter(
+            username__in=set(data['usernames'])
+        ).update(role=data['role'])
+        return Response({'updated': updated}, status=status.HTTP_200_OK)
 
     @action(
         methods=['GET', 'PATCH'],
@@ -32,9 +96,9 @@ class UsersViewSet(viewsets.ModelViewSet):
         url_path='me'
     )
     def get_current_user_info(self, request):
-        user = get_object_or_404(User, id=request.user.id)
+        # Пользователь уже загружен при аутентификации запроса.
         if request.method == 'GET':
-            serializer = self.get_serializer(user)
+            serializer = self.get_serializer(request.user)
             return Response(serializer.data, status=status.HTTP_200_OK)
         serializer = UsersSerializer(
             request.user,
@@ -51,6 +115,7 @@ class APISignup(APIView):
     """    API эндпоинт для регистрации новых пользователей."""
 
     permission_classes = (permissions.AllowAny,)
+    throttle_classes = (SignupThrottle,)
 
     @staticmethod
     def send_email(data):
@@ -83,21 +148,55 @@ class APIGetToken(APIView):
     """Эндпоинт для получения токена."""
 
     permission_classes = (permissions.AllowAny,)
+    throttle_classes = (TokenThrottle,)
 
     def post(self, request):
         serializer = GetTokenSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         data = serializer.validated_data
-        try:
-            user = User.objects.get(username=data['username'])
-        except User.DoesNotExist:
+        # Для выдачи токена нужны только id и код подтверждения: строка
+        # пользователя целиком и экземпляр модели не создаются.
+        user = User.objects.filter(username=data['username']).values_list(
+            'id', 'confirmation_code'
+        ).first()
+        if user is None:
             return Response(
                 {'username': 'Пользователь не найден!'},
                 status=status.HTTP_404_NOT_FOUND)
-        if data.get('confirmation_code') == user.confirmation_code:
-            token = RefreshToken.for_user(user).access_token
-            return Response({'token': str(token)},
+        user_id, confirmation_code = user
+        if constant_time_compare(
+            data['confirmation_code'], confirmation_code or ''
+        ):
+            access, refresh = tokens_for(user_id)
+            return Response({'token': str(access), 'refresh': str(refresh)},
                             status=status.HTTP_201_CREATED)
         return Response(
             {'confirmation_code': 'Неверный код подтверждения!'},
             status=status.HTTP_400_BAD_REQUEST)
+
+
+class APITokenRefresh(APIView):
+    """Эндпоинт для обмена refresh-токена на новую пару токенов."""
+
+    permission_classes = (permissions.AllowAny,)
+    throttle_classes = (TokenRefreshThrottle,)
+
+    def post(self, request):
+        serializer = TokenRefreshSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        access, refresh = rotate(serializer.validated_data['refresh'])
+        return Response({'token': str(access), 'refresh': str(refresh)},
+                        status=status.HTTP_200_OK)
+
+
+class APITokenRevoke(APIView):
+    """Эндпоинт для отзыва refresh-токена при выходе из сессии."""
+
+    permission_classes = (permissions.AllowAny,)
+    throttle_classes = (TokenRefreshThrottle,)
+
+    def post(self, request):
+        serializer = TokenRefreshSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        revoke(serializer.validated_data['refresh'])
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -1,3 +1,5 @@
+import os
+from datetime import timedelta
 from pathlib import Path
 
 
@@ -30,6 +32,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.core.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -70,6 +73,73 @@ DATABASES = {
     }
 }
 
+# Реплика для чтения. Локально её роль играет второй файл SQLite,
+# в тестах она зеркалирует основную БД.
+REPLICA_DATABASE_NAME = os.getenv('YAMDB_REPLICA_DB')
+if REPLICA_DATABASE_NAME:
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': REPLICA_DATABASE_NAME,
+        'TEST': {'MIRROR': 'default'},
+    }
+
+# Кэш хранит счётчики ограничения частоты запросов и закрепление
+# клиентов за основной БД. По умолчанию он живёт в памяти процесса;
+# чтобы счётчики были общими для нескольких воркеров, укажите каталог
+# файлового кэша (или настройте Redis/Memcached).
+CACHE_DIR = os.getenv('YAMDB_CACHE_DIR')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+if CACHE_DIR:
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_DIR,
+    }
+
+# Кэш списка отозванных refresh-токенов. Он должен быть общим для всех
+# воркеров: кэш в памяти процесса допускается только при DEBUG, иначе
+# обмен и отзыв токенов завершаются ошибкой ImproperlyConfigured.
+JWT_DENYLIST_CACHE = 'default'
+
+# Наибольшая длительность сессии: токены, полученные обменом refresh-
+# токена, действуют не дольше этого срока после входа по коду.
+JWT_SESSION_LIFETIME = timedelta(days=30)
+
+READ_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+
+DATABASE_ROUTERS = ['api.core.replicas.ReplicaRouter']
+
+# Сколько секунд после записи клиент читает только из основной БД.
+REPLICA_PRIMARY_STICKY_SECONDS = 10
+
+# Метрики запросов: заголовок Server-Timing и размер выборки
+# для расчёта процентилей по каждому view.
+METRICS_SERVER_TIMING = False
+METRICS_SAMPLE_SIZE = 1000
+
+# Журнал медленных SQL-запросов и статистика по отпечаткам запросов
+# (SQL без литералов). Отпечатки попадают в /api/v1/_metrics.
+SLOW_QUERY_LOG_ENABLED = False
+SLOW_QUERY_THRESHOLD_MS = 100
+SLOW_QUERY_TOP_FINGERPRINTS = 50
+
+# Размер пула потоков, в котором асинхронные эндпоинты выполняют запросы к БД.
+ASYNC_ORM_MAX_WORKERS = 16
+
+# Наибольшее число отзывов в одном запросе массового создания.
+REVIEWS_BULK_MAX_SIZE = 1000
+
+# Наибольшее число пользователей в одном запросе массового создания
+# или смены роли.
+USERS_BULK_MAX_SIZE = 1000
+
+# Число знаков после запятой в рейтинге произведения. После изменения
+# нужна миграция: python manage.py makemigrations reviews.
+RATING_DECIMAL_PLACES = 2
+
 
 # Password validation
 
@@ -104,6 +174,13 @@ REST_FRAMEWORK = {
         'rest_framework.parsers.MultiPartParser',
     ],
     'UNAUTHENTICATED_USER': None,
+    # Лимиты анонимных эндпоинтов регистрации и получения токена,
+    # отдельно для каждого IP, username и email.
+    'DEFAULT_THROTTLE_RATES': {
+        'signup': '100/hour',
+        'token': '100/hour',
+        'token_refresh': '300/hour',
+    },
 }
 
 
@@ -0,0 +1,250 @@
+import random
+from array import array
+from datetime import datetime
+from math import gcd
+from time import perf_counter
+
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max
+
+from api_yamdb.utils import batched
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from users.models import ADMIN, MODERATOR, USER, User
+
+WORDS = (
+    'тень', 'город', 'время', 'путь', 'свет', 'море', 'ночь', 'дом',
+    'звезда', 'память', 'огонь', 'ветер', 'песня', 'зима', 'река',
+    'сон', 'голос', 'лес', 'небо', 'дорога', 'сердце', 'мир', 'край',
+    'история', 'тайна', 'война', 'любовь', 'остров', 'берег', 'музыка',
+)
+FIRST_NAMES = (
+    'Анна', 'Иван', 'Мария', 'Пётр', 'Елена', 'Олег', 'Ольга', 'Павел',
+)
+LAST_NAMES = (
+    'Иванов', 'Смирнов', 'Кузнецов', 'Попов', 'Соколов', 'Лебедев',
+)
+GENERATED_PASSWORD = UNUSABLE_PASSWORD_PREFIX + 'generated'
+TEXT_POOL_SIZE = 1000
+
+
+def ids_after(model, last_id):
+    """Идентификаторы записей модели, созданных после last_id."""
+    return array('q', model.objects.filter(id__gt=last_id).order_by(
+        'id'
+    ).values_list('id', flat=True).iterator(chunk_size=10000))
+
+
+def last_id(model):
+    return model.objects.aggregate(last=Max('id'))['last'] or 0
+
+
+class Command(BaseCommand):
+    help = (
+        'Генерирует синтетических пользователей, категории, жанры, '
+        'произведения, отзывы и комментарии для нагрузочного тестирования.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--genres', type=int, default=30)
+        parser.add_argument('--titles', type=int, default=1000)
+        parser.add_argument('--reviews', type=int, default=10000)
+        parser.add_argument('--comments', type=int, default=20000)
+        parser.add_argument(
+            '--zipf', type=float, default=1.1,
+            help='Показатель распределения Ципфа популярности произведений.'
+        )
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--prefix', default='gen',
+            help='Префикс имён пользователей и слагов.'
+        )
+
+    def handle(self, *args, **options):
+        if min(options['users'], options['categories'], options['genres'],
+               options['titles']) < 1:
+            raise CommandError(
+                'Нужен хотя бы один пользователь, категория, жанр '
+                'и произведение.'
+            )
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.prefix = options['prefix']
+        self.started = perf_counter()
+        # Тексты берутся из заранее собранного набора: генерация слов
+        # для каждого из миллионов отзывов стоила бы дороже вставки.
+        self.texts = [
+            self.words(self.rng.randint(3, 30))
+            for _ in range(TEXT_POOL_SIZE)
+        ]
+
+        users = self.create_users(options['users'])
+        categories = self.create_named(
+            Category, 'categories', options['categories']
+        )
+        genres = self.create_named(Genre, 'genres', options['genres'])
+        titles = self.create_titles(options['titles'], categories, genres)
+        reviews = self.create_reviews(
+            options['reviews'], titles, users, options['zipf']
+        )
+        self.create_comments(options['comments'], reviews, users)
+        # Созданные произведения идут подряд после titles[0]; диапазон
+        # вместо списка id не упирается в лимит параметров запроса.
+        Title.objects.filter(id__gte=titles[0]).update_ratings()
+        self.report('ratings', len(titles))
+
+    def report(self, name, count):
+        self.stdout.write(
+            f'{name}: {count} ({perf_counter() - self.started:.1f} s)'
+        )
+
+    def bulk_create(self, model, objects):
+        for batch in batched(objects, self.batch_size):
+            model.objects.bulk_create(batch)
+
+    def words(self, count):
+        return ' '.join(self.rng.choice(WORDS) for _ in range(count))
+
+    def create_users(self, count):
+        rng = self.rng
+        start = last_id(User)
+
+        def generate():
+            for i in range(count):
+                chance = rng.random()
+                role = (
+                    ADMIN if chance < 0.001
+                    else MODERATOR if chance < 0.01
+                    else USER
+                )
+                username = f'{self.prefix}_user_{i}'
+                yield User(
+                    username=username,
+                    email=f'{username}@yamdb.fake',
+                    password=GENERATED_PASSWORD,
+                    role=role,
+                    first_name=rng.choice(FIRST_NAMES),
+                    last_name=rng.choice(LAST_NAMES),
+                    bio=rng.choice(self.texts),
+                )
+
+        self.bulk_create(User, generate())
+        users = ids_after(User, start)
+        self.report('users', len(users))
+        return users
+
+    def create_named(self, model, label, count):
+        start = last_id(model)
+        self.bulk_create(model, (
+            model(
+                name=self.words(2).capitalize(),
+                slug=f'{self.prefix}-{label}-{i}'
+            )
+            for i in range(count)
+        ))
+        ids = ids_after(model, start)
+        self.report(label, len(ids))
+        return ids
+
+    def create_titles(self, count, categories, genres):
+        rng = self.rng
+        start = last_id(Title)
+        year = datetime.now().year
+        self.bulk_create(Title, (
+            Title(
+                name=self.words(rng.randint(1, 4)).capitalize(),
+                year=rng.randint(1900, year),
+                category_id=rng.choice(categories),
+                description=rng.choice(self.texts),
+            )
+            for _ in range(count)
+        ))
+        titles = ids_after(Title, start)
+        self.bulk_create(GenreTitle, (
+            GenreTitle(title_id=title, genre_id=genre)
+            for title in titles
+            for genre in rng.sample(genres, min(len(genres),
+                                                rng.randint(1, 3)))
+        ))
+        self.report('titles', len(titles))
+        return titles
+
+    def review_counts(self, total, titles, users_count, exponent):
+        """Число отзывов по произведениям по закону Ципфа.
+
+        Произведения перемешиваются, место в рейтинге популярности
+        определяет вес 1 / rank ** exponent. На одно произведение
+        приходится не больше отзывов, чем пользователей.
+        """
+        ranked = list(titles)
+        self.rng.shuffle(ranked)
+        weights = [1 / rank ** exponent for rank in range(1, len(ranked) + 1)]
+        scale = total / sum(weights)
+        counts = [min(users_count, int(weight * scale)) for weight in weights]
+        remainder = total - sum(counts)
+        while remainder > 0:
+            for index in range(len(counts)):
+                if remainder == 0:
+                    break
+                if counts[index] < users_count:
+                    counts[index] += 1
+                    remainder -= 1
+        return zip(ranked, counts)
+
+    def create_reviews(self, total, titles, users, exponent):
+        rng = self.rng
+        users_count = len(users)
+        if total > users_count * len(titles):
+            total = users_count * len(titles)
+            self.stderr.write(
+                f'Каждый пользователь пишет не больше одного отзыва на '
+                f'произведение: отзывов будет {total}.'
+            )
+        start = last_id(Review)
+
+        def generate():
+            for title, count in self.review_counts(
+                total, titles, users_count, exponent
+            ):
+                # Разные авторы: start + j * stride по модулю числа
+                # пользователей при stride, взаимно простом с ним.
+                offset = rng.randrange(users_count)
+                stride = 1
+                if users_count > 1:
+                    stride = rng.randrange(1, users_count)
+                    while gcd(stride, users_count) != 1:
+                        stride = rng.randrange(1, users_count)
+                quality = rng.gauss(7, 1.5)
+                for j in range(count):
+                    yield Review(
+                        title_id=title,
+                        author_id=users[(offset + j * stride) % users_count],
+                        text=rng.choice(self.texts),
+                        score=min(10, max(1, round(rng.gauss(quality, 2)))),
+                    )
+
+        self.bulk_create(Review, generate())
+        reviews = ids_after(Review, start)
+        self.report('reviews', len(reviews))
+        return reviews
+
+    def create_comments(self, total, reviews, users):
+        if not reviews:
+            return
+        rng = self.rng
+        start = last_id(Comment)
+        # Отзывы созданы в порядке популярности произведений, поэтому
+        # смещение к началу списка даёт больше комментариев популярным.
+        self.bulk_create(Comment, (
+            Comment(
+                review_id=reviews[int(len(reviews) * rng.random() ** 2)],
+                author_id=rng.choice(users),
+                text=rng.choice(self.texts),
+            )
+            for _ in range(total)
+        ))
+        Review.objects.filter(id__gte=reviews[0]).update_comment_counts()
+        self.report('comments', last_id(Comment) - start)
@@ -0,0 +1,58 @@
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.models import Comment, Review
+
+
+def purge(model, batch_size):
+    """Физическое удаление помеченных строк модели пачками по id.
+
+    Помеченные строки находятся по частичному индексу, каждая пачка
+    удаляется в своей транзакции; возвращает число удалённых строк
+    по моделям, включая каскадные.
+    """
+    deleted = Counter()
+    last_id = 0
+    while True:
+        ids = list(model.all_objects.filter(
+            is_deleted=True, id__gt=last_id
+        ).order_by('id').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        last_id = ids[-1]
+        with transaction.atomic():
+            _, counts = model.all_objects.filter(id__in=ids).delete()
+        deleted.update(counts)
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет из базы отзывы и комментарии, помеченные удалёнными, '
+        'пачками по id.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только показать число помеченных строк, ничего не удаляя.'
+        )
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            reviews = Review.all_objects.filter(is_deleted=True).count()
+            comments = Comment.all_objects.filter(is_deleted=True).count()
+            self.stdout.write(
+                f'Помечено удалёнными отзывов: {reviews}, '
+                f'комментариев: {comments}'
+            )
+            return
+        # Отзывы удаляются первыми: комментарии к ним уходят каскадом.
+        deleted = purge(Review, options['batch_size'])
+        deleted.update(purge(Comment, options['batch_size']))
+        self.stdout.write(
+            f'Удалено отзывов: {deleted[Review._meta.label]}, '
+            f'комментариев: {deleted[Comment._meta.label]}'
+        )
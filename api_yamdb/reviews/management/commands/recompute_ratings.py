@@ -0,0 +1,142 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import Count, Max, Min, Sum
+
+from reviews.models import Ratio, Review, Title
+
+FIELDS = ('rating', 'score_sum', 'review_count', 'last_review_at')
+
+
+def recompute_range(first_id, last_id, batch_size, dry_run, progress=None):
+    """Пересчитывает агрегаты произведений с id от first_id до last_id.
+
+    Агрегаты по отзывам всего диапазона читаются потоком из одного
+    запроса с GROUP BY title_id и сливаются с произведениями, которые
+    выбираются пачками по id. Возвращает число проверенных произведений
+    и список расхождений вида (id, поле, было, стало).
+    """
+    rating_field = Title._meta.get_field('rating')
+    aggregates = Review.objects.filter(
+        title_id__gte=first_id, title_id__lte=last_id
+    ).values_list('title_id').annotate(
+        rating=Ratio(Sum('score'), Count('id'), output_field=rating_field),
+        score_sum=Sum('score'),
+        review_count=Count('id'),
+        last_review_at=Max('pub_date'),
+    ).order_by('title_id').iterator(chunk_size=batch_size)
+    empty = (None, None, 0, 0, None)
+    row = next(aggregates, empty)
+
+    checked, mismatches, after = 0, [], first_id - 1
+    while True:
+        titles = list(Title.objects.filter(
+            id__gt=after, id__lte=last_id
+        ).order_by('id').values_list('id', *FIELDS)[:batch_size])
+        if not titles:
+            break
+        after = titles[-1][0]
+        changed = []
+        for title_id, *stored in titles:
+            while row[0] is not None and row[0] < title_id:
+                row = next(aggregates, empty)
+            actual = row[1:] if row[0] == title_id else empty[1:]
+            differences = [
+                (title_id, field, old, new)
+                for field, old, new in zip(FIELDS, stored, actual)
+                if old != new
+            ]
+            if differences:
+                mismatches.extend(differences)
+                changed.append(
+                    Title(id=title_id, **dict(zip(FIELDS, actual)))
+                )
+        checked += len(titles)
+        if changed and not dry_run:
+            Title.objects.bulk_update(changed, FIELDS)
+        if progress is not None:
+            progress(len(titles))
+    return checked, mismatches
+
+
+def split_range(first_id, last_id, parts):
+    """Делит отрезок id на parts примерно равных непересекающихся частей."""
+    size = -(-(last_id - first_id + 1) // parts)
+    return [
+        (start, min(start + size - 1, last_id))
+        for start in range(first_id, last_id + 1, size)
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает рейтинг, сумму и число оценок и дату последнего '
+        'отзыва всех произведений и исправляет расхождения.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help='Число процессов; диапазон id произведений делится '
+                 'между ними поровну.'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только показать расхождения, ничего не записывая.'
+        )
+
+    def handle(self, *args, **options):
+        bounds = Title.objects.aggregate(first=Min('id'), last=Max('id'))
+        if bounds['first'] is None:
+            self.stdout.write('Произведений нет.')
+            return
+        self.verbosity = options['verbosity']
+        self.total = Title.objects.count()
+        self.done = 0
+        arguments = (options['batch_size'], options['dry_run'])
+        ranges = split_range(
+            bounds['first'], bounds['last'], max(1, options['workers'])
+        )
+        if len(ranges) == 1:
+            checked, mismatches = recompute_range(
+                *ranges[0], *arguments, progress=self.progress
+            )
+        else:
+            checked, mismatches = self.run_parallel(ranges, arguments)
+
+        if options['dry_run']:
+            for title_id, field, old, new in sorted(mismatches):
+                self.stdout.write(f'title {title_id}: {field} {old} -> {new}')
+        action = 'расхождений' if options['dry_run'] else 'исправлено'
+        fixed = len({title_id for title_id, *_ in mismatches})
+        self.stdout.write(
+            f'Произведений проверено: {checked}, {action}: {fixed}'
+        )
+
+    def run_parallel(self, ranges, arguments):
+        # Дочерние процессы открывают собственные соединения с базой.
+        connections.close_all()
+        checked, mismatches = 0, []
+        with ProcessPoolExecutor(
+            max_workers=len(ranges), initializer=django.setup
+        ) as pool:
+            futures = [
+                pool.submit(recompute_range, *bounds, *arguments)
+                for bounds in ranges
+            ]
+            for future in as_completed(futures):
+                range_checked, range_mismatches = future.result()
+                checked += range_checked
+                mismatches.extend(range_mismatches)
+                self.progress(range_checked)
+        return checked, mismatches
+
+    def progress(self, count):
+        self.done += count
+        if self.verbosity:
+            self.stderr.write(
+                f'Произведений обработано: {self.done}/{self.total}'
+            )
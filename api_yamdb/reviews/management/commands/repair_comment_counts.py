@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from reviews.models import Comment, Review
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает число комментариев к отзывам одним сгруппированным '
+        'запросом и исправляет расхождения.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только показать расхождения, ничего не записывая.'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        # Число комментариев по отзывам читается потоком в порядке id
+        # и сливается с отзывами, которые выбираются пачками по id.
+        counts = Comment.objects.values_list('review_id').annotate(
+            total=Count('id')
+        ).order_by('review_id').iterator(chunk_size=batch_size)
+        review_id, total = next(counts, (None, 0))
+
+        checked = fixed = last_id = 0
+        while True:
+            reviews = list(Review.objects.filter(id__gt=last_id).order_by(
+                'id'
+            ).values_list('id', 'comment_count')[:batch_size])
+            if not reviews:
+                break
+            last_id = reviews[-1][0]
+            changed = []
+            for current_id, stored in reviews:
+                while review_id is not None and review_id < current_id:
+                    review_id, total = next(counts, (None, 0))
+                actual = total if review_id == current_id else 0
+                if actual != stored:
+                    changed.append(Review(id=current_id, comment_count=actual))
+                    if options['dry_run']:
+                        self.stdout.write(
+                            f'review {current_id}: {stored} -> {actual}'
+                        )
+            checked += len(reviews)
+            fixed += len(changed)
+            if changed and not options['dry_run']:
+                Review.objects.bulk_update(changed, ['comment_count'])
+        action = 'расхождений' if options['dry_run'] else 'исправлено'
+        self.stdout.write(f'Отзывов проверено: {checked}, {action}: {fixed}')
@@ -0,0 +1,51 @@
+# Generated by Django 3.2 on 2026-10-19 09:47
+
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_review_counts(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Title = apps.get_model('reviews', 'Title')
+
+    def reviews(aggregate):
+        return Subquery(Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title').annotate(value=aggregate).values(
+            'value'
+        ))
+
+    Title.objects.update(
+        review_count=Coalesce(reviews(Count('id')), 0),
+        last_review_at=reviews(Max('pub_date')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_review_comment_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='last_review_at',
+            field=models.DateTimeField(blank=True, help_text='Обновляется вместе с рейтингом', null=True, verbose_name='Дата последнего отзыва'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, help_text='Обновляется вместе с рейтингом', verbose_name='Число отзывов'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['-review_count'], name='title_review_count_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['-last_review_at'], name='title_last_review_idx'),
+        ),
+        migrations.RunPython(fill_review_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 3.2 on 2026-10-19 09:49
+
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_score_sums(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    places = Title._meta.get_field('rating').decimal_places
+    quantum = Decimal(1).scaleb(-places)
+    titles = []
+    for title in Title.objects.annotate(
+        total=Sum('reviews__score'), count=Count('reviews')
+    ).iterator():
+        title.score_sum = title.total or 0
+        title.rating = None
+        if title.count:
+            title.rating = (
+                Decimal(title.score_sum) / title.count
+            ).quantize(quantum, rounding=ROUND_HALF_UP)
+        titles.append(title)
+        if len(titles) == 1000:
+            Title.objects.bulk_update(titles, ['score_sum', 'rating'])
+            titles = []
+    Title.objects.bulk_update(titles, ['score_sum', 'rating'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_title_review_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='score_sum',
+            field=models.PositiveIntegerField(default=0, help_text='Обновляется вместе с рейтингом', verbose_name='Сумма оценок'),
+        ),
+        migrations.AlterField(
+            model_name='title',
+            name='rating',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='Рейтинг произведения (вычисляется автоматически)', max_digits=4, null=True, verbose_name='Рейтинг'),
+        ),
+        migrations.RunPython(fill_score_sums, migrations.RunPython.noop),
+    ]
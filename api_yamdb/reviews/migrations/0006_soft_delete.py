@@ -0,0 +1,47 @@
+# Generated by Django 3.2 on 2026-10-19 10:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_title_score_sum'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='review',
+            name='unique_review',
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='is_deleted',
+            field=models.BooleanField(default=False, help_text='Удалённые комментарии скрыты и очищаются командой purge_deleted', verbose_name='Удалён'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='is_deleted',
+            field=models.BooleanField(default=False, help_text='Удалённые отзывы скрыты и очищаются командой purge_deleted', verbose_name='Удалён'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(is_deleted=False), fields=['review', '-pub_date'], name='comment_review_live_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(is_deleted=True), fields=['id'], name='comment_deleted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(condition=models.Q(is_deleted=False), fields=['title', '-pub_date'], name='review_title_live_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(condition=models.Q(is_deleted=True), fields=['id'], name='review_deleted_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='review',
+            constraint=models.UniqueConstraint(condition=models.Q(is_deleted=False), fields=('title', 'author'), name='unique_review'),
+        ),
+    ]
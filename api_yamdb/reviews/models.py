@@ -1,13 +1,25 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from types import SimpleNamespace
+
+from django.conf import settings
 from django.core.validators import (
     MaxValueValidator, RegexValidator, MinValueValidator
 )
-from django.db import models
-from django.db.models import Avg
+from django.db import IntegrityError, models, transaction
+from django.db.models import (
+    Count, F, Func, Max, OuterRef, Subquery, Sum
+)
+from django.db.models.functions import Coalesce
 from django.utils.timezone import now
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from users.models import User
 
+# Произведения и отзывы, пересчёт агрегатов которых отложен до выхода
+# из defer_aggregate_updates(); None — пересчёт выполняется сразу.
+_deferred_updates = ContextVar('deferred_updates', default=None)
+
 
 class Category(models.Model):
     """Категории произведений (Фильмы, Книги, Музыка)."""
@@ -61,6 +73,45 @@ class Genre(models.Model):
         return self.name
 
 
+class SoftDeleteManager(models.Manager):
+    """Менеджер, скрывающий записи, помеченные удалёнными."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_deleted=False)
+
+
+class ReviewQuerySet(models.QuerySet):
+
+    def soft_delete(self):
+        """Пометка отзывов выборки и комментариев к ним удалёнными.
+
+        Строки остаются в базе до очистки командой purge_deleted, рейтинг
+        каждого затронутого произведения пересчитывается один раз.
+        """
+        with transaction.atomic():
+            reviews = list(self.filter(is_deleted=False).values_list(
+                'id', 'title_id'
+            ))
+            ids = [review_id for review_id, _ in reviews]
+            Comment.objects.filter(review_id__in=ids).update(is_deleted=True)
+            deleted = Review.all_objects.filter(id__in=ids).update(
+                is_deleted=True
+            )
+            Title.objects.filter(
+                id__in={title_id for _, title_id in reviews}
+            ).update_ratings()
+        return deleted
+
+    def update_comment_counts(self):
+        """Пересчёт числа комментариев всех отзывов выборки одним UPDATE."""
+        comments = Comment.objects.filter(
+            review=OuterRef('pk')
+        ).order_by().values('review').annotate(total=Count('id')).values(
+            'total'
+        )
+        return self.update(comment_count=Coalesce(Subquery(comments), 0))
+
+
 class Review(models.Model):
     """Модель для хранения отзывов на произведения."""
 
@@ -96,21 +147,144 @@ class Review(models.Model):
         auto_now_add=True,
         help_text='Дата создания отзыва'
     )
+    comment_count = models.PositiveIntegerField(
+        'Число комментариев',
+        default=0,
+        help_text='Обновляется автоматически'
+    )
+    is_deleted = models.BooleanField(
+        'Удалён',
+        default=False,
+        help_text='Удалённые отзывы скрыты и очищаются командой '
+                  'purge_deleted'
+    )
+
+    # Менеджер по умолчанию скрывает удалённые отзывы, в том числе
+    # в title.reviews; all_objects возвращает все строки.
+    objects = SoftDeleteManager.from_queryset(ReviewQuerySet)()
+    all_objects = ReviewQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
         ordering = ('-pub_date',)
         constraints = [
+            # Удалённый отзыв не мешает автору написать новый.
             models.UniqueConstraint(
                 fields=['title', 'author'],
+                condition=models.Q(is_deleted=False),
                 name='unique_review'
             )
         ]
+        indexes = [
+            # Частичные индексы: список отзывов произведения читает только
+            # действующие строки, очистка — только удалённые.
+            models.Index(
+                fields=['title', '-pub_date'],
+                condition=models.Q(is_deleted=False),
+                name='review_title_live_idx'
+            ),
+            models.Index(
+                fields=['id'],
+                condition=models.Q(is_deleted=True),
+                name='review_deleted_idx'
+            ),
+        ]
 
     def __str__(self):
         return f'Отзыв от {self.author} на {self.title}'
 
+    def soft_delete(self):
+        """Пометка отзыва и комментариев к нему удалёнными.
+
+        Строки не удаляются и не каскадируются; рейтинг произведения
+        сдвигается на одну оценку, как при обычном удалении.
+        """
+        with transaction.atomic():
+            if not Review.all_objects.filter(
+                id=self.id, is_deleted=False
+            ).update(is_deleted=True):
+                return False
+            Comment.objects.filter(review_id=self.id).update(is_deleted=True)
+            shift_title_aggregates(self, deleted=True)
+        self.is_deleted = True
+        return True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Исходная оценка нужна, чтобы при изменении отзыва перенести её
+        # в другую корзину статистики оценок.
+        instance._loaded_score = instance.__dict__.get('score')
+        return instance
+
+
+def title_reviews(aggregate):
+    """Подзапрос с агрегатом по отзывам произведения из внешнего запроса."""
+    return Subquery(Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title').annotate(value=aggregate).values('value'))
+
+
+class Ratio(Func):
+    """Частное numerator / denominator, округлённое до RATING_DECIMAL_PLACES.
+
+    Деление выполняется в базе в десятичной арифметике, при нулевом
+    знаменателе результат — NULL.
+    """
+
+    output_field = models.DecimalField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        numerator, denominator = self.source_expressions
+        numerator_sql, numerator_params = compiler.compile(numerator)
+        denominator_sql, denominator_params = compiler.compile(denominator)
+        places = int(settings.RATING_DECIMAL_PLACES)
+        return (
+            f'ROUND(1.0 * ({numerator_sql}) / '
+            f'NULLIF({denominator_sql}, 0), {places})',
+            (*numerator_params, *denominator_params)
+        )
+
+
+class TitleQuerySet(models.QuerySet):
+
+    def update_ratings(self):
+        """Пересчёт рейтинга всех произведений выборки одним UPDATE.
+
+        Тем же запросом пересчитываются число отзывов и дата последнего
+        отзыва, а также пересобирается статистика оценок.
+        """
+        self.update_score_stats()
+        score_sum = Coalesce(title_reviews(Sum('score')), 0)
+        review_count = Coalesce(title_reviews(Count('id')), 0)
+        return self.update(
+            rating=Ratio(score_sum, review_count),
+            score_sum=score_sum,
+            review_count=review_count,
+            last_review_at=title_reviews(Max('pub_date')),
+        )
+
+    def update_score_stats(self):
+        """Пересборка статистики оценок произведений выборки.
+
+        Число оценок каждого значения считается одним GROUP BY, старые
+        строки статистики заменяются новыми.
+        """
+        counts = {}
+        for title_id, score, total in Review.objects.filter(
+            title__in=self.values('id')
+        ).values_list('title_id', 'score').annotate(total=Count('id')):
+            counts.setdefault(title_id, {})[f'score_{score}'] = total
+        with transaction.atomic():
+            TitleScoreStats.objects.filter(
+                title__in=self.values('id')
+            ).delete()
+            TitleScoreStats.objects.bulk_create(
+                TitleScoreStats(title_id=title_id, **scores)
+                for title_id, scores in counts.items()
+            )
+
 
 class Title(models.Model):
     """Произведения (фильмы, книги, музыкальные треки)."""
@@ -145,26 +319,134 @@ class Title(models.Model):
         null=True,
         help_text='Добавьте описание произведения (необязательно)'
     )
-    rating = models.IntegerField(
+    rating = models.DecimalField(
         'Рейтинг',
+        max_digits=settings.RATING_DECIMAL_PLACES + 2,
+        decimal_places=settings.RATING_DECIMAL_PLACES,
         null=True,
         blank=True,
         help_text='Рейтинг произведения (вычисляется автоматически)'
     )
+    score_sum = models.PositiveIntegerField(
+        'Сумма оценок',
+        default=0,
+        help_text='Обновляется вместе с рейтингом'
+    )
+    review_count = models.PositiveIntegerField(
+        'Число отзывов',
+        default=0,
+        help_text='Обновляется вместе с рейтингом'
+    )
+    last_review_at = models.DateTimeField(
+        'Дата последнего отзыва',
+        null=True,
+        blank=True,
+        help_text='Обновляется вместе с рейтингом'
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         ordering = ('-year', 'name')
+        indexes = [
+            models.Index(
+                fields=['-review_count'], name='title_review_count_idx'
+            ),
+            models.Index(
+                fields=['-last_review_at'], name='title_last_review_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
     def update_rating(self):
         """Обновление рейтинга при изменении отзывов"""
-        avg_score = self.reviews.aggregate(Avg('score'))['score__avg']
-        self.rating = int(avg_score) if avg_score else None
-        self.save()
+        Title.objects.filter(pk=self.pk).update_ratings()
+        self.refresh_from_db(
+            fields=['rating', 'score_sum', 'review_count', 'last_review_at']
+        )
+
+
+class TitleScoreStatsManager(models.Manager):
+
+    def shift(self, title_id, add=None, remove=None):
+        """Переносит одну оценку между корзинами статистики произведения.
+
+        add — добавленная оценка, remove — убранная; строка статистики
+        создаётся при первой оценке произведения.
+        """
+        if add == remove:
+            return
+        changes = {}
+        if remove is not None:
+            changes[f'score_{remove}'] = F(f'score_{remove}') - 1
+        if add is not None:
+            changes[f'score_{add}'] = F(f'score_{add}') + 1
+        if self.filter(title_id=title_id).update(**changes) or add is None:
+            return
+        try:
+            with transaction.atomic():
+                self.create(title_id=title_id, **{f'score_{add}': 1})
+        except IntegrityError:
+            # Строку успел создать параллельный запрос.
+            self.filter(title_id=title_id).update(**changes)
+
+
+class TitleScoreStats(models.Model):
+    """Число оценок каждого значения от 1 до 10 для произведения.
+
+    Обновляется вместе с рейтингом при каждом изменении отзыва, поэтому
+    статистика произведения читается одной строкой по первичному ключу.
+    """
+
+    title = models.OneToOneField(
+        Title,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='score_stats',
+        verbose_name='Произведение'
+    )
+    score_1 = models.PositiveIntegerField('Оценок 1', default=0)
+    score_2 = models.PositiveIntegerField('Оценок 2', default=0)
+    score_3 = models.PositiveIntegerField('Оценок 3', default=0)
+    score_4 = models.PositiveIntegerField('Оценок 4', default=0)
+    score_5 = models.PositiveIntegerField('Оценок 5', default=0)
+    score_6 = models.PositiveIntegerField('Оценок 6', default=0)
+    score_7 = models.PositiveIntegerField('Оценок 7', default=0)
+    score_8 = models.PositiveIntegerField('Оценок 8', default=0)
+    score_9 = models.PositiveIntegerField('Оценок 9', default=0)
+    score_10 = models.PositiveIntegerField('Оценок 10', default=0)
+
+    objects = TitleScoreStatsManager()
+
+    class Meta:
+        verbose_name = 'Статистика оценок'
+        verbose_name_plural = 'Статистика оценок'
+
+    def __str__(self):
+        return f'Статистика оценок {self.title_id}'
+
+    @property
+    def histogram(self):
+        """Число оценок 1, 2, ..., 10."""
+        return [getattr(self, f'score_{score}') for score in range(1, 11)]
+
+    @property
+    def count(self):
+        return sum(self.histogram)
+
+    @property
+    def average(self):
+        count = self.count
+        if not count:
+            return None
+        return sum(
+            score * total
+            for score, total in enumerate(self.histogram, start=1)
+        ) / count
 
 
 class GenreTitle(models.Model):
@@ -223,20 +505,121 @@ class Comment(models.Model):
         auto_now_add=True,
         help_text='Дата создания комментария'
     )
+    is_deleted = models.BooleanField(
+        'Удалён',
+        default=False,
+        help_text='Удалённые комментарии скрыты и очищаются командой '
+                  'purge_deleted'
+    )
+
+    objects = SoftDeleteManager()
+    all_objects = models.Manager()
 
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('-pub_date',)
+        indexes = [
+            models.Index(
+                fields=['review', '-pub_date'],
+                condition=models.Q(is_deleted=False),
+                name='comment_review_live_idx'
+            ),
+            models.Index(
+                fields=['id'],
+                condition=models.Q(is_deleted=True),
+                name='comment_deleted_idx'
+            ),
+        ]
 
     def __str__(self):
         return f'Комментарий от {self.author} к отзыву {self.review.id}'
 
+    def soft_delete(self):
+        """Пометка комментария удалённым; False — он уже был удалён."""
+        self.is_deleted = True
+        return bool(Comment.objects.filter(id=self.id).update(is_deleted=True))
+
+
+@contextmanager
+def defer_aggregate_updates():
+    """Откладывает пересчёт агрегатов до выхода из блока.
+
+    Каскадное удаление отправляет сигнал для каждого отзыва; внутри
+    блока затронутые произведения только запоминаются, а рейтинги и
+    статистика оценок пересчитываются в конце по одному разу. Отзывы,
+    число комментариев которых нужно пересчитать, добавляются в
+    review_ids объекта, который возвращает менеджер контекста.
+    """
+    deferred = SimpleNamespace(title_ids=set(), review_ids=set())
+    token = _deferred_updates.set(deferred)
+    try:
+        yield deferred
+    finally:
+        _deferred_updates.reset(token)
+    if deferred.title_ids:
+        Title.objects.filter(id__in=deferred.title_ids).update_ratings()
+    if deferred.review_ids:
+        Review.objects.filter(
+            id__in=deferred.review_ids
+        ).update_comment_counts()
+
 
 @receiver([post_save, post_delete], sender=Review)
 def update_title_rating(sender, instance, **kwargs):
     """
-    Сигнал для обновления рейтинга произведения при изменении отзывов.
-
+    Сигнал для обновления рейтинга и статистики оценок произведения
+    при изменении отзывов.
     """
-    instance.title.update_rating()
+    if instance.is_deleted:
+        # Отзыв исключён из агрегатов при пометке удалённым; сохранение
+        # и физическое удаление такого отзыва их не меняют.
+        return
+    shift_title_aggregates(
+        instance,
+        deleted=kwargs['signal'] is post_delete,
+        created=kwargs.get('created', False)
+    )
+
+
+def shift_title_aggregates(instance, deleted=False, created=False):
+    """Сдвиг рейтинга и статистики оценок произведения на один отзыв."""
+    deferred = _deferred_updates.get()
+    if deferred is not None:
+        deferred.title_ids.add(instance.title_id)
+        return
+    loaded_score = getattr(instance, '_loaded_score', None)
+    title = Title.objects.filter(id=instance.title_id)
+    if deleted:
+        score_delta, count_delta = -instance.score, -1
+        TitleScoreStats.objects.shift(instance.title_id, remove=instance.score)
+    elif created:
+        score_delta, count_delta = instance.score, 1
+        TitleScoreStats.objects.shift(instance.title_id, add=instance.score)
+    elif loaded_score is None:
+        # Отзыв сохранён без загрузки из базы: прежняя оценка неизвестна.
+        instance._loaded_score = instance.score
+        title.update_ratings()
+        return
+    else:
+        score_delta, count_delta = instance.score - loaded_score, 0
+        TitleScoreStats.objects.shift(
+            instance.title_id, add=instance.score, remove=loaded_score
+        )
+    instance._loaded_score = instance.score
+
+    # Рейтинг, сумма оценок, число отзывов и дата последнего отзыва
+    # меняются одним UPDATE. Рейтинг идёт первым и считается из прежних
+    # значений со сдвигом, поэтому не зависит от порядка присваиваний.
+    score_sum = F('score_sum') + score_delta
+    review_count = F('review_count') + count_delta
+    changes = {
+        'rating': Ratio(score_sum, review_count),
+        'score_sum': score_sum,
+        'review_count': review_count,
+    }
+    if deleted:
+        changes['last_review_at'] = title_reviews(Max('pub_date'))
+    elif created:
+        changes['last_review_at'] = instance.pub_date
+    title.update(**changes)
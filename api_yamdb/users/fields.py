@@ -0,0 +1,27 @@
+from django.db import models
+
+
+class LowercaseCopyField(models.CharField):
+    """Копия строкового поля source в нижнем регистре.
+
+    Значение вычисляется в pre_save, который Django вызывает и при
+    save(), и при bulk_create(), поэтому поле заполнено у всех
+    созданных записей. Изменения через update() и bulk_update() поле
+    не пересчитывают: source нужно менять через save().
+    """
+
+    def __init__(self, *args, source=None, **kwargs):
+        self.source = source
+        kwargs.setdefault('editable', False)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['source'] = self.source
+        kwargs.pop('editable', None)
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        value = getattr(model_instance, self.source).lower()
+        setattr(model_instance, self.attname, value)
+        return value
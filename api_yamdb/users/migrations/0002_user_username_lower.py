@@ -0,0 +1,34 @@
+# Generated by Django 3.2 on 2026-10-19 10:05
+
+from django.db import migrations
+import users.fields
+
+
+def fill_username_lower(apps, schema_editor):
+    # LOWER() в SQLite меняет регистр только латиницы, поэтому значения
+    # считаются в Python, как и в LowercaseCopyField.pre_save.
+    User = apps.get_model('users', 'User')
+    users = []
+    for user in User.objects.only('id', 'username').iterator():
+        user.username_lower = user.username.lower()
+        users.append(user)
+        if len(users) == 1000:
+            User.objects.bulk_update(users, ['username_lower'])
+            users = []
+    User.objects.bulk_update(users, ['username_lower'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='username_lower',
+            field=users.fields.LowercaseCopyField(db_index=True, default='', help_text='Заполняется автоматически; по нему ищут по префиксу', max_length=150, source='username', verbose_name='Пользователь в нижнем регистре'),
+        ),
+        migrations.RunPython(fill_username_lower, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,7 @@
 from django.contrib.auth.models import AbstractUser, Group, Permission
 from django.core.validators import (RegexValidator)
 from django.db import models
+from .fields import LowercaseCopyField
 from .validators import validate_username
 
 
@@ -36,6 +37,14 @@ class User(AbstractUser):
             'unique': ('Пользователь с таким именем уже зарегистрирован.')
         },
     )
+    username_lower = LowercaseCopyField(
+        'Пользователь в нижнем регистре',
+        source='username',
+        max_length=150,
+        db_index=True,
+        default='',
+        help_text='Заполняется автоматически; по нему ищут по префиксу'
+    )
     email = models.EmailField(
         'Электронная почта',
         max_length=254,
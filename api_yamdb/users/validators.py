@@ -1,11 +1,14 @@
 from django.core.exceptions import ValidationError
 
+# Имена, совпадающие с путями эндпоинтов /api/v1/users/<path>/.
+RESERVED_USERNAMES = ('me', 'bulk')
+
 
 def validate_username(value):
-    """Валидация: username != me"""
+    """Валидация: username не совпадает с путём эндпоинта users/."""
 
-    if value == 'me':
+    if value.lower() in RESERVED_USERNAMES:
         raise ValidationError(
-            ('Имя пользователя не может быть <me>.'),
+            ('Имя пользователя не может быть <%(value)s>.'),
             params={'value': value},
         )
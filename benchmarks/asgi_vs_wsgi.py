@@ -0,0 +1,138 @@
+"""Нагрузочное сравнение WSGI- и ASGI-развёртываний YaMDb.
+
+Оба сервера запускаются заранее, например:
+
+    cd api_yamdb
+    gunicorn api_yamdb.wsgi -w 4 -b 127.0.0.1:8000
+    uvicorn api_yamdb.asgi:application --workers 1 --port 8001
+
+и скрипт нагружает их одинаковым набором чтений: синхронные эндпоинты
+`/api/v1/...` на WSGI и асинхронные `/api/v1/async/...` на ASGI.
+Параметр --slow-clients открывает соединения, которые отправляют
+заголовки запроса по байту и тем самым занимают обработчики сервера.
+
+    python -m benchmarks.asgi_vs_wsgi --wsgi http://127.0.0.1:8000 \\
+        --asgi http://127.0.0.1:8001 --requests 2000 --concurrency 50 \\
+        --slow-clients 500
+"""
+import argparse
+import json
+import socket
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from benchmarks.utils import percentile, to_ms
+
+READ_PATHS = (
+    'titles/',
+    'titles/{title_id}/',
+    'titles/{title_id}/reviews/',
+)
+
+
+def open_slow_clients(base_url, count):
+    """Открывает соединения с незавершёнными заголовками запроса."""
+    parts = urlsplit(base_url)
+    sockets = []
+    for _ in range(count):
+        try:
+            sock = socket.create_connection(
+                (parts.hostname, parts.port or 80), timeout=5
+            )
+            sock.sendall(b'GET /api/v1/titles/ HTTP/1.1\r\n')
+        except OSError:
+            break
+        sockets.append(sock)
+    return sockets
+
+
+def feed_slow_clients(sockets):
+    for sock in list(sockets):
+        try:
+            sock.sendall(b'X')
+        except OSError:
+            sockets.remove(sock)
+
+
+def fetch(url):
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=30) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as error:
+        status = error.code
+    except OSError:
+        status = None
+    return status, time.perf_counter() - started
+
+
+def run(base_url, prefix, args):
+    urls = [
+        f'{base_url}{prefix}{path.format(title_id=args.title_id)}'
+        for path in READ_PATHS
+    ]
+    slow = open_slow_clients(base_url, args.slow_clients)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        futures = [
+            pool.submit(fetch, urls[i % len(urls)])
+            for i in range(args.requests)
+        ]
+        results = []
+        for future in futures:
+            results.append(future.result())
+            if len(results) % 100 == 0:
+                feed_slow_clients(slow)
+    elapsed = time.perf_counter() - started
+    for sock in slow:
+        sock.close()
+
+    latencies = [latency for status, latency in results if status == 200]
+    return {
+        'url': base_url + prefix,
+        'requests': len(results),
+        'errors': len(results) - len(latencies),
+        'slow_clients': len(slow),
+        'seconds': round(elapsed, 3),
+        'rps': round(len(results) / elapsed, 1),
+        'p50_ms': to_ms(percentile(latencies, 0.50)),
+        'p95_ms': to_ms(percentile(latencies, 0.95)),
+        'p99_ms': to_ms(percentile(latencies, 0.99)),
+        'mean_ms': to_ms(statistics.mean(latencies) if latencies else None),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--wsgi', default='http://127.0.0.1:8000')
+    parser.add_argument('--asgi', default='http://127.0.0.1:8001')
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--slow-clients', type=int, default=0)
+    parser.add_argument('--title-id', type=int, default=1)
+    parser.add_argument('--output', help='Файл для сохранения результатов')
+    args = parser.parse_args()
+
+    report = {
+        'wsgi': run(args.wsgi, '/api/v1/', args),
+        'asgi': run(args.asgi, '/api/v1/async/', args),
+    }
+    for name, result in report.items():
+        print(
+            f'{name}: {result["rps"]} rps, p50 {result["p50_ms"]} ms, '
+            f'p95 {result["p95_ms"]} ms, p99 {result["p99_ms"]} ms, '
+            f'errors {result["errors"]}/{result["requests"]}, '
+            f'slow clients {result["slow_clients"]}'
+        )
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+"""Микробенчмарки сериализаторов и классов прав доступа YaMDb.
+
+Каждый замер работает с объектами моделей в памяти: связанные объекты
+и жанры подставляются в кэш экземпляров, а любое обращение к базе во
+время замера считается ошибкой. Так измеряется только стоимость CPU
+на один объект, без шума от базы данных. Валидация полей, которая
+сама ходит в базу (слаги, уникальность), сюда не входит — её покрывают
+тесты бюджета запросов.
+
+Результат — лучшее из --repeat повторов, в микросекундах на объект.
+С --compare замеры сравниваются с прошлым прогоном, и скрипт завершается
+с кодом 1, если какой-то замер медленнее на --threshold процентов.
+
+    python -m benchmarks.microbench --output micro.json
+    python -m benchmarks.microbench --compare micro.json
+"""
+import argparse
+import json
+import sys
+import timeit
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from benchmarks.utils import git_revision, setup_django
+
+
+def forbid_queries(execute, sql, params, many, context):
+    raise AssertionError(f'Микробенчмарк обратился к базе: {sql}')
+
+
+def prefetched(instance, name, objects):
+    """Подставляет объекты в кэш prefetch_related экземпляра."""
+    queryset = getattr(type(instance), name).rel.model.objects.none()
+    queryset._result_cache = list(objects)
+    queryset._prefetch_done = True
+    instance._prefetched_objects_cache = {name: queryset}
+    return instance
+
+
+def build_objects(count):
+    from reviews.models import Category, Comment, Genre, Review, Title
+    from users.models import ADMIN, MODERATOR, USER, User
+
+    users = {
+        role: User(id=number, username=f'bench_{role}', role=role,
+                   email=f'bench_{role}@yamdb.fake', bio='Биография')
+        for number, role in enumerate((USER, MODERATOR, ADMIN), start=1)
+    }
+    authors = [
+        User(id=100 + i, username=f'author_{i}', role=USER,
+             email=f'author_{i}@yamdb.fake')
+        for i in range(count)
+    ]
+    category = Category(id=1, name='Книги', slug='books')
+    genres = [
+        Genre(id=i, name=f'Жанр {i}', slug=f'genre-{i}') for i in range(3)
+    ]
+    titles = [
+        prefetched(
+            Title(id=i, name=f'Произведение {i}', year=2000, rating=7,
+                  score_sum=21, review_count=3,
+                  description='Описание', category=category),
+            'genre', genres
+        )
+        for i in range(count)
+    ]
+    reviews = [
+        Review(id=i, title=titles[i], author=authors[i], text='Текст отзыва',
+               score=7, pub_date=datetime.now(timezone.utc))
+        for i in range(count)
+    ]
+    comments = [
+        Comment(id=i, review=reviews[i], author=authors[i],
+                text='Текст комментария',
+                pub_date=datetime.now(timezone.utc))
+        for i in range(count)
+    ]
+    return SimpleNamespace(
+        users=users, authors=authors, titles=titles, reviews=reviews,
+        comments=comments,
+    )
+
+
+def build_cases(objects):
+    """Замеры: имя -> (функция, число объектов за один вызов)."""
+    from api.core.permissions import AdminOnly, IsAuthorOrModeratorOrAdmin
+    from api.reviews.serializers import CommentSerializer, ReviewSerializer
+    from api.titles.serializers import (
+        TitleReadSerializer, TitleWriteSerializer
+    )
+    from api.users.serializers import UsersSerializer
+
+    users = objects.users
+    count = len(objects.titles)
+    admin_request = SimpleNamespace(user=users['admin'], method='GET')
+    patch_request = SimpleNamespace(user=users['user'], method='PATCH')
+    profiles = [users['user'], users['moderator'], users['admin']]
+    profiles = (profiles * count)[:count]
+    review_data = {'text': 'Новый текст', 'score': 8}
+    comment_data = {'text': 'Новый комментарий'}
+
+    # Проверки прав: запрос каждой роли к чужому и собственному объекту.
+    requests = [
+        SimpleNamespace(user=user, method=method)
+        for user in users.values()
+        for method in ('GET', 'PATCH', 'DELETE')
+    ]
+    checks = [
+        (request, review)
+        for request in requests
+        for review in (objects.reviews[0], SimpleNamespace(
+            author=request.user, author_id=request.user.id
+        ))
+    ]
+    admin_only = AdminOnly()
+    author_or_staff = IsAuthorOrModeratorOrAdmin()
+
+    def new_requests():
+        # role_mask() кэширует маску в запросе; без сброса после первого
+        # повтора замерялось бы только чтение атрибута. Как и в реальном
+        # запросе, маска считается один раз на запрос.
+        for request in requests:
+            request.__dict__.pop('_role_mask', None)
+
+    def check_admin_only():
+        new_requests()
+        for request, obj in checks:
+            admin_only.has_permission(request, None)
+            admin_only.has_object_permission(request, None, obj)
+
+    def check_author_or_staff():
+        new_requests()
+        for request, obj in checks:
+            author_or_staff.has_object_permission(request, None, obj)
+
+    def validate(serializer_class, data, context):
+        def run():
+            for _ in range(count):
+                serializer_class(data=data, context=context).is_valid(
+                    raise_exception=True
+                )
+        return run
+
+    return {
+        'TitleReadSerializer': (
+            lambda: TitleReadSerializer(objects.titles, many=True).data,
+            count
+        ),
+        'TitleWriteSerializer': (
+            lambda: TitleWriteSerializer(objects.titles, many=True).data,
+            count
+        ),
+        'ReviewSerializer': (
+            lambda: ReviewSerializer(objects.reviews, many=True).data,
+            count
+        ),
+        'ReviewSerializer.is_valid': (
+            validate(ReviewSerializer, review_data,
+                     {'request': patch_request}),
+            count
+        ),
+        'CommentSerializer': (
+            lambda: CommentSerializer(objects.comments, many=True).data,
+            count
+        ),
+        'CommentSerializer.is_valid': (
+            validate(CommentSerializer, comment_data, {}), count
+        ),
+        'UsersSerializer': (
+            lambda: UsersSerializer(
+                profiles, many=True, context={'request': admin_request}
+            ).data,
+            count
+        ),
+        'AdminOnly': (check_admin_only, len(checks)),
+        'IsAuthorOrModeratorOrAdmin': (check_author_or_staff, len(checks)),
+    }
+
+
+def measure(cases, number, repeat):
+    from django.db import connection
+
+    results = {}
+    with connection.execute_wrapper(forbid_queries):
+        for name, (function, objects) in cases.items():
+            best = min(timeit.repeat(function, number=number, repeat=repeat))
+            results[name] = round(best / (number * objects) * 1e6, 3)
+    return results
+
+
+def print_report(results, baseline, threshold):
+    """Печатает таблицу и возвращает список замедлившихся замеров."""
+    header = f'{"benchmark":<30} {"µs/object":>10}'
+    if baseline:
+        header += f' {"baseline":>10} {"Δ%":>8}'
+    print(header)
+    regressions = []
+    for name, value in results.items():
+        line = f'{name:<30} {value:>10}'
+        old = baseline.get(name) if baseline else None
+        if old:
+            change = (value - old) / old * 100
+            line += f' {old:>10} {change:>+8.1f}'
+            if change > threshold:
+                line += '  REGRESSION'
+                regressions.append(name)
+        print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--objects', type=int, default=100,
+        help='Число объектов, сериализуемых за один вызов'
+    )
+    parser.add_argument('--number', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--output', help='Файл для сохранения результатов')
+    parser.add_argument('--compare', help='Результаты прошлого прогона')
+    parser.add_argument(
+        '--threshold', type=float, default=10,
+        help='Допустимое замедление относительно --compare, %%'
+    )
+    args = parser.parse_args()
+
+    setup_django()
+    cases = build_cases(build_objects(args.objects))
+    results = measure(cases, args.number, args.repeat)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)['results']
+    regressions = print_report(results, baseline, args.threshold)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({
+                'revision': git_revision(),
+                'created': datetime.now(timezone.utc).isoformat(),
+                'objects': args.objects,
+                'results': results,
+            }, file, indent=2, ensure_ascii=False)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,341 @@
+"""Воспроизведение журнала запросов к YaMDb с замером производительности.
+
+Журнал — JSONL, по одному запросу в строке:
+
+    {"method": "GET", "path": "/api/v1/titles/{title_id}/reviews/",
+     "as": "user", "data": {"text": "...", "score": 7}, "weight": 5}
+
+`as` — anon, user, moderator или admin; `weight` — сколько раз повторить
+запрос за проход. В `path` и строковых значениях `data` подставляются
+{title_id}, {review_id}, {comment_id}, {username}, {category}, {genre}
+и {n} (порядковый номер запроса) из засеянной базы.
+
+В режиме inprocess запросы идут через тестовый клиент DRF в отдельную
+SQLite-базу (`--db`), число SQL-запросов считается напрямую. В режиме
+http запросы отправляет пул потоков на запущенный сервер
+(`--base-url`), который работает с той же базой; число SQL-запросов
+берётся из заголовка Server-Timing (METRICS_SERVER_TIMING = True).
+
+    python -m benchmarks.replay --db /tmp/bench.sqlite3 --seed-data \\
+        --titles 1000 --reviews 20000 --output results.json
+    python -m benchmarks.replay --db /tmp/bench.sqlite3 \\
+        --compare results.json
+"""
+import argparse
+import json
+import random
+import re
+import statistics
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.utils import git_revision, percentile, setup_django, to_ms
+
+DEFAULT_LOG = Path(__file__).resolve().with_name('traffic.jsonl')
+ROLES = ('user', 'moderator', 'admin')
+SAMPLE_SIZE = 10000
+LOCMEM_EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+_SERVER_TIMING_QUERIES_RE = re.compile(r'db-queries;desc="(\d+)"')
+
+
+def load_log(path):
+    entries = []
+    with open(path) as file:
+        for line in file:
+            if line.strip():
+                entry = json.loads(line)
+                entries.extend([entry] * entry.get('weight', 1))
+    return entries
+
+
+def seed(args):
+    """Заполняет базу синтетическими данными заданного объёма."""
+    from django.core.management import call_command
+
+    call_command(
+        'generate_data', users=args.users, titles=args.titles,
+        reviews=args.reviews, comments=args.comments, seed=args.seed,
+        # Повторный засев той же базы не должен упираться в уникальность.
+        prefix=f'seed{int(time.time())}',
+    )
+
+
+def bench_users():
+    """Создаёт пользователей для каждой роли и выпускает им токены."""
+    from rest_framework_simplejwt.tokens import AccessToken
+    from users.models import User
+
+    tokens = {}
+    for role in ROLES:
+        user, _ = User.objects.get_or_create(
+            username=f'bench_{role}',
+            defaults={'email': f'bench_{role}@yamdb.fake', 'role': role}
+        )
+        tokens[role] = str(AccessToken.for_user(user))
+    return tokens
+
+
+class Fixtures:
+    """Выборка существующих объектов для подстановки в запросы."""
+
+    def __init__(self, rng):
+        from reviews.models import Category, Comment, Genre, Review, Title
+        from users.models import User
+
+        self.rng = rng
+        self.titles = list(
+            Title.objects.values_list('id', flat=True)[:SAMPLE_SIZE]
+        )
+        self.reviews = list(
+            Review.objects.values_list('id', 'title_id')[:SAMPLE_SIZE]
+        )
+        self.comments = list(
+            Comment.objects.values_list(
+                'id', 'review_id', 'review__title_id'
+            )[:SAMPLE_SIZE]
+        )
+        self.usernames = list(
+            User.objects.values_list('username', flat=True)[:SAMPLE_SIZE]
+        )
+        self.categories = list(
+            Category.objects.values_list('slug', flat=True)[:SAMPLE_SIZE]
+        )
+        self.genres = list(
+            Genre.objects.values_list('slug', flat=True)[:SAMPLE_SIZE]
+        )
+
+    def _choice(self, values):
+        return self.rng.choice(values) if values else 0
+
+    def context(self, number):
+        comment_id, review_id, title_id = self._choice(self.comments) or (
+            0, 0, 0
+        )
+        if not comment_id:
+            review_id, title_id = self._choice(self.reviews) or (0, 0)
+        return {
+            'n': number,
+            'title_id': title_id or self._choice(self.titles),
+            'review_id': review_id,
+            'comment_id': comment_id,
+            'username': self._choice(self.usernames),
+            'category': self._choice(self.categories),
+            'genre': self._choice(self.genres),
+        }
+
+
+def render(entry, context):
+    """Подставляет значения в путь и тело запроса."""
+    path = entry['path'].format(**context)
+    data = entry.get('data')
+    if data is not None:
+        data = json.loads(
+            json.dumps(data),
+            object_hook=lambda obj: {
+                key: value.format(**context) if isinstance(value, str)
+                else value
+                for key, value in obj.items()
+            }
+        )
+    return entry['method'].upper(), path, data
+
+
+def endpoint_name(method, path):
+    from django.urls import Resolver404, resolve
+    try:
+        name = resolve(path.split('?')[0]).url_name
+    except Resolver404:
+        name = 'unresolved'
+    return f'{method} {name}'
+
+
+def run_inprocess(requests, tokens):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIClient
+
+    clients = {'anon': APIClient(raise_request_exception=False)}
+    for role, token in tokens.items():
+        clients[role] = APIClient(raise_request_exception=False)
+        clients[role].credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    results = []
+    for role, method, path, data in requests:
+        client = clients[role]
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = client.generic(
+                method, path,
+                json.dumps(data) if data is not None else '',
+                content_type='application/json'
+            )
+            elapsed = time.perf_counter() - started
+        results.append(
+            (method, path, response.status_code, elapsed, len(queries))
+        )
+    return results
+
+
+def _send(base_url, tokens, role, method, path, data):
+    request = urllib.request.Request(
+        base_url + path, method=method,
+        data=json.dumps(data).encode() if data is not None else None,
+        headers={'Content-Type': 'application/json'}
+    )
+    if role in tokens:
+        request.add_header('Authorization', f'Bearer {tokens[role]}')
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            response.read()
+            status, headers = response.status, response.headers
+    except urllib.error.HTTPError as error:
+        status, headers = error.code, error.headers
+    elapsed = time.perf_counter() - started
+    match = _SERVER_TIMING_QUERIES_RE.search(
+        headers.get('Server-Timing', '')
+    )
+    queries = int(match.group(1)) if match else None
+    return method, path, status, elapsed, queries
+
+
+def run_http(requests, tokens, base_url, concurrency):
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [
+            pool.submit(_send, base_url, tokens, *request)
+            for request in requests
+        ]
+        return [future.result() for future in futures]
+
+
+def summarize(results, elapsed):
+    by_endpoint = defaultdict(list)
+    for method, path, status, latency, queries in results:
+        by_endpoint[endpoint_name(method, path)].append(
+            (status, latency, queries)
+        )
+    endpoints = {}
+    for name, rows in sorted(by_endpoint.items()):
+        latencies = [latency for _, latency, _ in rows]
+        queries = [count for _, _, count in rows if count is not None]
+        endpoints[name] = {
+            'requests': len(rows),
+            'errors': sum(1 for status, _, _ in rows if status >= 500),
+            'client_errors': sum(
+                1 for status, _, _ in rows if 400 <= status < 500
+            ),
+            'p50_ms': to_ms(percentile(latencies, 0.50)),
+            'p95_ms': to_ms(percentile(latencies, 0.95)),
+            'p99_ms': to_ms(percentile(latencies, 0.99)),
+            'mean_queries': (
+                round(statistics.mean(queries), 2) if queries else None
+            ),
+            'max_queries': max(queries) if queries else None,
+        }
+    return {
+        'requests': len(results),
+        'seconds': round(elapsed, 3),
+        'throughput_rps': round(len(results) / elapsed, 1) if elapsed else 0,
+        'endpoints': endpoints,
+    }
+
+
+def print_report(report, baseline=None):
+    base = baseline['endpoints'] if baseline else {}
+    header = (
+        f'{"endpoint":<32} {"n":>6} {"p50":>9} {"p95":>9} {"p99":>9} '
+        f'{"queries":>8}'
+    )
+    if baseline:
+        header += f' {"Δp95":>9} {"Δqueries":>9}'
+    print(header)
+    for name, row in report['endpoints'].items():
+        line = (
+            f'{name:<32} {row["requests"]:>6} {row["p50_ms"]:>9} '
+            f'{row["p95_ms"]:>9} {row["p99_ms"]:>9} '
+            f'{str(row["mean_queries"]):>8}'
+        )
+        old = base.get(name)
+        if old:
+            line += f' {_delta(row["p95_ms"], old["p95_ms"]):>9}'
+            line += f' {_delta(row["mean_queries"], old["mean_queries"]):>9}'
+        print(line)
+    print(
+        f'total: {report["requests"]} requests in {report["seconds"]} s, '
+        f'{report["throughput_rps"]} rps'
+    )
+
+
+def _delta(new, old):
+    if new is None or old is None:
+        return '-'
+    return f'{new - old:+.2f}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--log', default=str(DEFAULT_LOG))
+    parser.add_argument(
+        '--mode', choices=('inprocess', 'http'), default='inprocess'
+    )
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--db', help='Файл SQLite для засева и запросов')
+    parser.add_argument('--seed-data', action='store_true')
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--titles', type=int, default=100)
+    parser.add_argument('--reviews', type=int, default=1000)
+    parser.add_argument('--comments', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--passes', type=int, default=1)
+    parser.add_argument('--output', help='Файл для сохранения результатов')
+    parser.add_argument('--compare', help='Результаты прошлого прогона')
+    args = parser.parse_args()
+
+    setup_django(args.db)
+    from django.conf import settings
+    from django.core.management import call_command
+    if args.mode == 'inprocess':
+        settings.EMAIL_BACKEND = LOCMEM_EMAIL_BACKEND
+    call_command('migrate', verbosity=0)
+    if args.seed_data:
+        seed(args)
+
+    rng = random.Random(args.seed)
+    fixtures = Fixtures(rng)
+    tokens = bench_users()
+    requests = []
+    for number, entry in enumerate(load_log(args.log) * args.passes):
+        role = entry.get('as', 'anon')
+        requests.append((role, *render(entry, fixtures.context(number))))
+
+    started = time.perf_counter()
+    if args.mode == 'http':
+        results = run_http(requests, tokens, args.base_url, args.concurrency)
+    else:
+        results = run_inprocess(requests, tokens)
+    report = summarize(results, time.perf_counter() - started)
+    report.update({
+        'revision': git_revision(),
+        'created': datetime.now(timezone.utc).isoformat(),
+        'mode': args.mode,
+        'log': args.log,
+    })
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+    print_report(report, baseline)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""Пропускная способность выдачи JWT-токенов на одном воркере.
+
+Запросы к /api/v1/auth/token/ идут подряд через тестовый клиент DRF в
+отдельную SQLite-базу (`--db`; по умолчанию — временный файл, который
+удаляется после замера), без сети и без параллелизма, поэтому
+результат — число токенов в секунду, которое выдаёт один процесс.
+Ограничение частоты запросов на время замера отключается.
+
+    python -m benchmarks.tokens --db /tmp/tokens.sqlite3 --requests 5000
+"""
+import argparse
+import json
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.utils import git_revision, percentile, setup_django, to_ms
+
+CONFIRMATION_CODE = 'bench-code'
+
+
+def create_users(count):
+    from users.models import User
+
+    User.objects.filter(username__startswith='token_bench_').delete()
+    User.objects.bulk_create([
+        User(username=f'token_bench_{i}', email=f'token_bench_{i}@yamdb.fake',
+             confirmation_code=CONFIRMATION_CODE)
+        for i in range(count)
+    ])
+    return list(User.objects.filter(
+        username__startswith='token_bench_'
+    ).values_list('username', flat=True))
+
+
+def run(usernames, requests, wrong_share):
+    from rest_framework.test import APIClient
+
+    client = APIClient()
+    latencies, issued = [], 0
+    started = time.perf_counter()
+    for number in range(requests):
+        wrong = number % 100 < wrong_share * 100
+        request_started = time.perf_counter()
+        response = client.post('/api/v1/auth/token/', {
+            'username': usernames[number % len(usernames)],
+            'confirmation_code': 'wrong' if wrong else CONFIRMATION_CODE,
+        }, format='json')
+        latencies.append(time.perf_counter() - request_started)
+        issued += response.status_code == 201
+    elapsed = time.perf_counter() - started
+    return {
+        'requests': requests,
+        'tokens': issued,
+        'seconds': round(elapsed, 3),
+        'tokens_per_second': round(issued / elapsed, 1),
+        'requests_per_second': round(requests / elapsed, 1),
+        'p50_ms': to_ms(percentile(latencies, 0.50)),
+        'p99_ms': to_ms(percentile(latencies, 0.99)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--db',
+        help='Файл SQLite для замера; по умолчанию — временный файл, '
+             'основная база проекта не используется'
+    )
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument(
+        '--wrong-share', type=float, default=0,
+        help='Доля запросов с неверным кодом подтверждения'
+    )
+    parser.add_argument('--output', help='Файл для сохранения результатов')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='yamdb-tokens-') as tmp_dir:
+        setup_django(args.db or Path(tmp_dir) / 'tokens.sqlite3')
+        from django.core.management import call_command
+        from django.db import connections
+        from api.core.throttles import TokenThrottle
+        call_command('migrate', verbosity=0)
+        TokenThrottle.THROTTLE_RATES = {TokenThrottle.scope: None}
+
+        report = run(
+            create_users(args.users), args.requests, args.wrong_share
+        )
+        connections.close_all()
+    print(
+        f'{report["tokens_per_second"]} tokens/s, '
+        f'{report["requests_per_second"]} requests/s, '
+        f'p50 {report["p50_ms"]} ms, p99 {report["p99_ms"]} ms '
+        f'({report["tokens"]} tokens in {report["seconds"]} s)'
+    )
+    if args.output:
+        report.update({
+            'revision': git_revision(),
+            'created': datetime.now(timezone.utc).isoformat(),
+        })
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,19 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def shared_cache(settings, tmp_path):
+    """Файловый кэш для списка отозванных токенов, общий для процессов.
+
+    Кэш в памяти процесса для списка не допускается при DEBUG = False,
+    с которым выполняются тесты, а пишут в список и обмен токенов, и
+    блокировка или удаление пользователей.
+    """
+    settings.CACHES = {
+        **settings.CACHES,
+        'tokens': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path / 'tokens-cache'),
+        },
+    }
+    settings.JWT_DENYLIST_CACHE = 'tokens'
@@ -0,0 +1,26 @@
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+
+REPLICA_ALIAS = 'replica'
+
+
+@pytest.fixture
+def replica(transactional_db, settings, tmp_path):
+    """Реплика для чтения — отдельный файл SQLite со своими данными.
+
+    База не зеркалирует основную: всё, что видит запрос, прочитанный
+    из реплики, должно быть записано в неё явно через using().
+    """
+    connections.settings[REPLICA_ALIAS] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': str(tmp_path / 'replica.sqlite3'),
+    }
+    call_command('migrate', database=REPLICA_ALIAS, verbosity=0)
+    settings.READ_REPLICAS = [REPLICA_ALIAS]
+    cache.clear()
+    yield REPLICA_ALIAS
+    connections[REPLICA_ALIAS].close()
+    del connections[REPLICA_ALIAS]
+    del connections.settings[REPLICA_ALIAS]
@@ -0,0 +1,150 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.test import RequestFactory
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08Replicas:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture(autouse=True)
+    def replicas(self, settings):
+        settings.READ_REPLICAS = ['replica']
+        cache.clear()
+
+    def test_01_router_reads_from_chosen_alias(self):
+        from api.core.replicas import ReplicaRouter, reading_from
+        from reviews.models import Title
+
+        router = ReplicaRouter()
+        assert router.db_for_read(Title) is None, (
+            'Проверьте, что вне запроса чтение выполняется из основной БД.'
+        )
+        with reading_from('replica'):
+            assert router.db_for_read(Title) == 'replica', (
+                'Проверьте, что роутер направляет чтение в выбранную '
+                'реплику.'
+            )
+            assert router.db_for_write(Title) is None, (
+                'Проверьте, что запись всегда выполняется в основную БД.'
+            )
+
+    def test_02_only_safe_methods_use_replica(self):
+        from api.core.replicas import PRIMARY_COOKIE_NAME, choose_replica
+
+        factory = RequestFactory()
+        assert choose_replica(factory.get(self.TITLES_URL)) == 'replica', (
+            'Проверьте, что GET-запрос читает из реплики.'
+        )
+        assert choose_replica(factory.post(self.TITLES_URL)) is None, (
+            'Проверьте, что POST-запрос работает с основной БД.'
+        )
+        request = factory.get(self.TITLES_URL)
+        request.COOKIES[PRIMARY_COOKIE_NAME] = '1'
+        assert choose_replica(request) is None, (
+            'Проверьте, что клиент с cookie закрепления читает из основной '
+            'БД.'
+        )
+
+    def test_03_read_your_writes(self, admin_client, user_client, user):
+        from api.core.replicas import PRIMARY_COOKIE_NAME, choose_replica
+
+        titles, _, _ = create_titles(admin_client)
+        response = create_single_review(
+            user_client, titles[0]['id'], 'review text', 7
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert PRIMARY_COOKIE_NAME in response.cookies, (
+            'Проверьте, что после записи клиент получает cookie закрепления '
+            'за основной БД.'
+        )
+
+        request = RequestFactory().get(self.TITLES_URL)
+        request.user = user
+        assert choose_replica(request) is None, (
+            'Проверьте, что автор записи без cookie всё равно читает из '
+            'основной БД в течение окна закрепления.'
+        )
+
+    def titles(self, client):
+        response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    def test_04_reads_from_replica_database(self, replica, user_client,
+                                            token_user):
+        from rest_framework.test import APIClient
+
+        from api.core.replicas import PRIMARY_COOKIE_NAME
+        from reviews.models import Category, Title
+
+        title = Title.objects.create(
+            name='Основная', year=2000,
+            category=Category.objects.create(name='Книги', slug='books')
+        )
+        Title.objects.using(replica).create(
+            name='Реплика', year=2000,
+            category=Category.objects.using(replica).create(
+                name='Книги', slug='books'
+            )
+        )
+        assert self.titles(APIClient()) == ['Реплика'], (
+            'Проверьте, что GET-запрос без закрепления читает данные из '
+            'реплики.'
+        )
+        pinned = APIClient()
+        pinned.cookies[PRIMARY_COOKIE_NAME] = '1'
+        assert self.titles(pinned) == ['Основная'], (
+            'Проверьте, что клиент с cookie закрепления читает из основной '
+            'БД.'
+        )
+
+        jwt_client = APIClient()
+        jwt_client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {token_user["access"]}'
+        )
+        assert self.titles(jwt_client) == ['Реплика']
+        response = create_single_review(user_client, title.id, 'text', 7)
+        assert response.status_code == HTTPStatus.CREATED
+        assert self.titles(jwt_client) == ['Основная'], (
+            'Проверьте, что после записи клиент с JWT без cookie читает из '
+            'основной БД.'
+        )
+
+    def test_05_bulk_writes_pin_to_primary(self, admin_client):
+        from api.core.replicas import PRIMARY_COOKIE_NAME
+
+        for url, data in (
+            ('/api/v1/reviews/bulk/', []),
+            ('/api/v1/reviews/bulk/delete/', {'ids': [100500]}),
+            ('/api/v1/comments/bulk/delete/', {'ids': [100500]}),
+            ('/api/v1/users/bulk/role/', {'usernames': ['nobody'],
+                                          'role': 'user'}),
+        ):
+            response = admin_client.post(url, data=data, format='json')
+            assert response.status_code < 400
+            assert PRIMARY_COOKIE_NAME in response.cookies, (
+                f'Проверьте, что после записи через `{url}` клиент '
+                'закрепляется за основной БД.'
+            )
+
+    def test_06_alias_reset_after_error(self, client, monkeypatch):
+        from api.core.replicas import _read_alias
+        from api.titles.views import TitleViewSet
+
+        def broken_list(self, request, *args, **kwargs):
+            raise ValueError('сбой представления')
+
+        monkeypatch.setattr(TitleViewSet, 'list', broken_list)
+        client.raise_request_exception = False
+        response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.INTERNAL_SERVER_ERROR
+        assert _read_alias.get() is None, (
+            'Проверьте, что алиас реплики сбрасывается и тогда, когда '
+            'представление завершилось исключением.'
+        )
@@ -0,0 +1,131 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments, create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09AsyncViews:
+
+    def test_01_async_matches_sync(self, client, admin_client, admin,
+                                   user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+        review_id = reviews[0]['id']
+        urls = (
+            'titles/',
+            f'titles/{title_id}/',
+            f'titles/{title_id}/reviews/',
+            f'titles/{title_id}/reviews/{review_id}/',
+            f'titles/{title_id}/reviews/{review_id}/comments/',
+            f'titles/{title_id}/reviews/{review_id}/comments/'
+            f'{comments[0]["id"]}/',
+        )
+        for url in urls:
+            sync_response = client.get(f'/api/v1/{url}')
+            async_response = client.get(f'/api/v1/async/{url}')
+            assert async_response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что GET-запрос к `/api/v1/async/{url}` '
+                'возвращает ответ со статусом 200.'
+            )
+            assert async_response.json() == sync_response.json(), (
+                f'Проверьте, что `/api/v1/async/{url}` возвращает те же '
+                f'данные, что и `/api/v1/{url}`.'
+            )
+
+    def test_02_async_errors(self, client):
+        response = client.get('/api/v1/async/titles/100500/')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что запрос к несуществующему произведению через '
+            'асинхронный эндпоинт возвращает ответ со статусом 404.'
+        )
+        response = client.get('/api/v1/async/titles/100500/reviews/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        response = client.post('/api/v1/async/titles/', data={})
+        assert response.status_code == HTTPStatus.METHOD_NOT_ALLOWED, (
+            'Проверьте, что асинхронные эндпоинты принимают только '
+            'GET-запросы.'
+        )
+
+    def asgi_get(self, url, **headers):
+        from asgiref.sync import async_to_sync
+        from django.test import AsyncClient
+
+        # AsyncClient в Django 3.2 передаёт именованные аргументы как
+        # заголовки ASGI: authorization, а не HTTP_AUTHORIZATION.
+        async def get():
+            return await AsyncClient().get(url, **headers)
+
+        return async_to_sync(get)()
+
+    def test_03_asgi_matches_sync(self, client, admin_client):
+        create_titles(admin_client)
+        response = self.asgi_get('/api/v1/async/titles/')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что асинхронный эндпоинт отвечает через ASGI.'
+        )
+        assert response.json() == client.get('/api/v1/titles/').json()
+
+    def test_04_asgi_authentication(self, replica, user_client, token_user):
+        from reviews.models import Category, Title
+
+        title = Title.objects.create(
+            name='Основная', year=2000,
+            category=Category.objects.create(name='Книги', slug='books')
+        )
+        Title.objects.using(replica).create(
+            name='Реплика', year=2000,
+            category=Category.objects.using(replica).create(
+                name='Книги', slug='books'
+            )
+        )
+        auth = {'authorization': f'Bearer {token_user["access"]}'}
+
+        def names():
+            response = self.asgi_get('/api/v1/async/titles/', **auth)
+            assert response.status_code == HTTPStatus.OK
+            return [item['name'] for item in response.json()['results']]
+
+        assert names() == ['Реплика']
+        response = create_single_review(user_client, title.id, 'text', 7)
+        assert response.status_code == HTTPStatus.CREATED
+        assert names() == ['Основная'], (
+            'Проверьте, что асинхронный эндпоинт аутентифицирует '
+            'пользователя и после его записи читает из основной БД.'
+        )
+        response = self.asgi_get(
+            '/api/v1/async/titles/', authorization='Bearer broken'
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что асинхронный эндпоинт отклоняет неверный токен.'
+        )
+
+    def test_05_identical_responses(self, client, admin_client, admin,
+                                    user_client, user):
+        create_comments(admin_client, {admin: admin_client, user: user_client})
+        for url, headers in (
+            ('titles/?rating_format=decimal', {}),
+            ('titles/?year=abc', {}),
+            ('titles/', {'HTTP_AUTHORIZATION': 'Bearer broken'}),
+        ):
+            sync_response = client.get(f'/api/v1/{url}', **headers)
+            async_response = client.get(f'/api/v1/async/{url}', **headers)
+            assert (
+                async_response.status_code, async_response.content
+            ) == (sync_response.status_code, sync_response.content), (
+                f'Проверьте, что `/api/v1/async/{url}` отвечает побайтно '
+                f'так же, как `/api/v1/{url}`, в том числе при ошибках.'
+            )
+            assert async_response.get('WWW-Authenticate') == (
+                sync_response.get('WWW-Authenticate')
+            )
+        response = self.asgi_get(
+            '/api/v1/async/titles/', authorization='Bearer broken'
+        )
+        assert response.content == sync_response.content
+        assert response['WWW-Authenticate'] == (
+            sync_response['WWW-Authenticate']
+        )
@@ -0,0 +1,109 @@
+import asyncio
+import re
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10Metrics:
+
+    METRICS_URL = '/api/v1/_metrics'
+
+    @pytest.fixture(autouse=True)
+    def clean_registry(self):
+        from api.core.metrics import registry
+        registry.reset()
+
+    def test_01_server_timing(self, client, admin_client, settings):
+        settings.METRICS_SERVER_TIMING = True
+        create_titles(admin_client)
+        response = client.get('/api/v1/titles/')
+        header = response.get('Server-Timing', '')
+        for metric in ('app;dur=', 'db;dur=', 'db-queries;desc=',
+                       'db-duplicates;desc='):
+            assert metric in header, (
+                'Проверьте, что при включённой настройке '
+                '`METRICS_SERVER_TIMING` ответ содержит метрику '
+                f'`{metric}` в заголовке `Server-Timing`.'
+            )
+
+        settings.METRICS_SERVER_TIMING = False
+        response = client.get('/api/v1/titles/')
+        assert 'Server-Timing' not in response, (
+            'Проверьте, что заголовок `Server-Timing` не отправляется, '
+            'если настройка выключена.'
+        )
+
+    def test_02_metrics_endpoint(self, client, user_client, admin_client):
+        create_titles(admin_client)
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/categories/')
+
+        assert client.get(self.METRICS_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        assert user_client.get(self.METRICS_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        ), (
+            f'Проверьте, что `{self.METRICS_URL}` доступен только '
+            'администратору.'
+        )
+        response = admin_client.get(self.METRICS_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'].startswith('text/plain')
+        content = response.content.decode()
+        for line in (
+            '# TYPE yamdb_request_duration_seconds summary',
+            'yamdb_request_duration_seconds_count'
+            '{view="titles-list",method="GET"} 1',
+            'yamdb_request_duration_seconds_count'
+            '{view="titles-list",method="POST"} 2',
+            'yamdb_db_queries'
+            '{view="categories-list",method="GET",quantile="0.99"}',
+            'yamdb_db_duplicate_queries_total'
+            '{view="titles-list",method="GET"}',
+        ):
+            assert line in content, (
+                f'Проверьте, что ответ `{self.METRICS_URL}` содержит '
+                f'строку `{line}`.'
+            )
+
+    def test_03_asgi_chain_is_async(self):
+        from asgiref.sync import SyncToAsync
+        from django.core.handlers.asgi import ASGIHandler
+
+        chain = ASGIHandler()._middleware_chain
+        assert not isinstance(chain, SyncToAsync), (
+            'Проверьте, что под ASGI цепочка middleware не оборачивается в '
+            'SyncToAsync: RequestMetricsMiddleware должен поддерживать '
+            'асинхронный режим.'
+        )
+        assert asyncio.iscoroutinefunction(chain)
+
+    @staticmethod
+    def db_queries(response):
+        match = re.search(
+            r'db-queries;desc="(\d+)"', response.get('Server-Timing', '')
+        )
+        assert match, 'Проверьте, что ответ содержит `Server-Timing`.'
+        return int(match.group(1))
+
+    def test_04_query_counts_on_every_path(self, client, admin_client,
+                                           settings):
+        from asgiref.sync import async_to_sync
+        from django.test import AsyncClient
+
+        async def asgi_get(url):
+            return await AsyncClient().get(url)
+
+        settings.METRICS_SERVER_TIMING = True
+        create_titles(admin_client)
+        for url in ('/api/v1/titles/', '/api/v1/async/titles/'):
+            assert self.db_queries(client.get(url)) > 0
+            assert self.db_queries(async_to_sync(asgi_get)(url)) > 0, (
+                f'Проверьте, что под ASGI для `{url}` считаются SQL-запросы, '
+                'в том числе выполненные в пуле потоков ORM.'
+            )
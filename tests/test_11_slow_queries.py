@@ -0,0 +1,73 @@
+import logging
+
+import pytest
+from django.db import connection
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11SlowQueries:
+
+    @pytest.fixture(autouse=True)
+    def clean_stats(self):
+        from api.core.querylog import fingerprint_stats
+        fingerprint_stats.reset()
+
+    def test_01_fingerprint(self):
+        from api.core.querylog import fingerprint
+
+        assert fingerprint(
+            "SELECT * FROM t WHERE a = 'x''y' AND b = 42 AND c = %s"
+        ) == 'SELECT * FROM t WHERE a = ? AND b = ? AND c = ?'
+        assert fingerprint(
+            'SELECT "score_10" FROM t WHERE id IN (%s, %s,\n %s) LIMIT 21'
+        ) == 'SELECT "score_10" FROM t WHERE id IN (...) LIMIT ?', (
+            'Проверьте, что списки IN и числовые литералы схлопываются, '
+            'а цифры в именах колонок сохраняются.'
+        )
+
+    def test_02_slow_query_log(self, client, admin_client, settings,
+                               caplog):
+        from api.core.querylog import SlowQueryLogger, fingerprint_stats
+
+        titles, _, _ = create_titles(admin_client)
+        settings.SLOW_QUERY_THRESHOLD_MS = 0
+        with caplog.at_level(logging.WARNING, logger='api.slow_queries'):
+            with connection.execute_wrapper(SlowQueryLogger()):
+                client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/')
+        messages = [record.getMessage() for record in caplog.records]
+        assert messages, (
+            'Проверьте, что запросы дольше порога попадают в журнал '
+            'медленных запросов.'
+        )
+        assert all('reviews-list' in message for message in messages), (
+            'Проверьте, что в журнале указывается имя view.'
+        )
+        assert any(
+            'api/reviews/views.py' in message and 'get_title' in message
+            for message in messages
+        ), 'Проверьте, что в журнале указывается кадр стека из `api/`.'
+        assert fingerprint_stats.top(10), (
+            'Проверьте, что для запросов накапливается статистика по '
+            'отпечаткам.'
+        )
+
+    def test_03_install_once(self):
+        from api.core.querylog import (
+            SlowQueryLogger, install_slow_query_logger
+        )
+
+        before = list(connection.execute_wrappers)
+        try:
+            install_slow_query_logger(sender=None, connection=connection)
+            install_slow_query_logger(sender=None, connection=connection)
+            loggers = [
+                wrapper for wrapper in connection.execute_wrappers
+                if isinstance(wrapper, SlowQueryLogger)
+            ]
+            assert len(loggers) == 1, (
+                'Проверьте, что обёртка подключается к соединению один раз.'
+            )
+        finally:
+            connection.execute_wrappers[:] = before
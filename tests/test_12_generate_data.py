@@ -0,0 +1,71 @@
+from decimal import ROUND_HALF_UP, Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count, Sum
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12GenerateData:
+
+    OPTIONS = dict(
+        users=20, categories=2, genres=3, titles=10, reviews=100,
+        comments=50, seed=7, batch_size=30
+    )
+
+    def generate(self, prefix):
+        call_command('generate_data', prefix=prefix, stdout=StringIO(),
+                     **self.OPTIONS)
+
+    def snapshot(self, prefix):
+        from reviews.models import Comment, Review
+
+        reviews = Review.objects.filter(
+            author__username__startswith=prefix
+        ).order_by('id')
+        comments = Comment.objects.filter(
+            author__username__startswith=prefix
+        ).order_by('id')
+        # Имена пользователей различаются только префиксом.
+        return (
+            [(review.author.username[len(prefix):], review.score, review.text)
+             for review in reviews],
+            [(comment.author.username[len(prefix):], comment.text)
+             for comment in comments],
+        )
+
+    def test_01_counts_and_ratings(self):
+        from reviews.models import Comment, Genre, Review, Title
+        from users.models import User
+
+        self.generate('a')
+        assert User.objects.count() == 20
+        assert Genre.objects.count() == 3
+        assert Title.objects.count() == 10
+        assert Review.objects.count() == 100
+        assert Comment.objects.count() == 50
+        assert not Review.objects.values('title', 'author').annotate(
+            total=Count('id')
+        ).filter(total__gt=1).exists(), (
+            'Проверьте, что пользователь оставляет не больше одного отзыва '
+            'на произведение.'
+        )
+        for title in Title.objects.annotate(
+            total=Sum('reviews__score'), count=Count('reviews')
+        ):
+            expected = None if not title.count else (
+                Decimal(title.total) / title.count
+            ).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+            assert title.rating == expected, (
+                'Проверьте, что после генерации рейтинги произведений '
+                'пересчитаны.'
+            )
+
+    def test_02_deterministic(self):
+        self.generate('a')
+        self.generate('b')
+        assert self.snapshot('a') == self.snapshot('b'), (
+            'Проверьте, что при одинаковом `seed` генерируются одинаковые '
+            'данные.'
+        )
@@ -0,0 +1,442 @@
+from itertools import count as counter
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+N = 3
+
+_sequence = counter()
+_budgets = {}
+
+
+def make_users(count):
+    from users.models import User
+
+    suffix = next(_sequence)
+    User.objects.bulk_create([
+        User(username=f'budget_{suffix}_{i}',
+             email=f'budget_{suffix}_{i}@yamdb.fake')
+        for i in range(count)
+    ])
+    return list(User.objects.filter(username__startswith=f'budget_{suffix}_'))
+
+
+def make_genres(count):
+    from reviews.models import Genre
+
+    suffix = next(_sequence)
+    Genre.objects.bulk_create([
+        Genre(name=f'Жанр {i}', slug=f'genre-{suffix}-{i}')
+        for i in range(count)
+    ])
+    return list(Genre.objects.filter(slug__startswith=f'genre-{suffix}-'))
+
+
+def make_titles(count, genres=0, reviews=0, comments=0):
+    """Произведения с заданным числом жанров, отзывов и комментариев."""
+    from reviews.models import (
+        Category, Comment, GenreTitle, Review, Title
+    )
+
+    suffix = next(_sequence)
+    category = Category.objects.create(
+        name=f'Категория {suffix}', slug=f'category-{suffix}'
+    )
+    Title.objects.bulk_create([
+        Title(name=f'Произведение {suffix}', year=2000, category=category)
+        for _ in range(count)
+    ])
+    titles = list(Title.objects.filter(category=category))
+    genre_objects = make_genres(genres)
+    GenreTitle.objects.bulk_create([
+        GenreTitle(title=title, genre=genre)
+        for title in titles for genre in genre_objects
+    ])
+    authors = make_users(max(reviews, comments))
+    Review.objects.bulk_create([
+        Review(title=title, author=author, text='Отзыв', score=5)
+        for title in titles for author in authors[:reviews]
+    ])
+    Comment.objects.bulk_create([
+        Comment(review=review, author=author, text='Комментарий')
+        for review in Review.objects.filter(title__in=titles)
+        for author in authors[:comments]
+    ])
+    Review.objects.filter(title__in=titles).update_comment_counts()
+    Title.objects.filter(category=category).update_ratings()
+    return titles
+
+
+def make_review(count):
+    """Отзыв с count комментариями на произведении с count отзывами."""
+    title, = make_titles(1, genres=count, reviews=count, comments=count)
+    return title, title.reviews.first()
+
+
+def title_url(title):
+    return f'/api/v1/titles/{title.id}/'
+
+
+def reviews_url(title):
+    return f'{title_url(title)}reviews/'
+
+
+def comments_url(review):
+    return f'{reviews_url(review.title)}{review.id}/comments/'
+
+
+def titles_list(count):
+    make_titles(count, genres=count, reviews=count)
+    return '/api/v1/titles/', None
+
+
+def titles_detail(count):
+    title, = make_titles(1, genres=count, reviews=count)
+    return title_url(title), None
+
+
+def titles_create(count):
+    genres = make_genres(count)
+    make_titles(1)
+    from reviews.models import Category
+    return '/api/v1/titles/', {
+        'name': 'Новое произведение', 'year': 2000,
+        'category': Category.objects.last().slug,
+        'genre': [genre.slug for genre in genres],
+    }
+
+
+def titles_update(count):
+    title, = make_titles(1, genres=count, reviews=count)
+    genres = make_genres(count)
+    return title_url(title), {'genre': [genre.slug for genre in genres]}
+
+
+def titles_delete(count):
+    title, = make_titles(1, genres=count, reviews=count, comments=count)
+    return title_url(title), None
+
+
+def categories_list(count):
+    make_titles(count)
+    return '/api/v1/categories/', None
+
+
+def categories_create(count):
+    make_titles(count)
+    return '/api/v1/categories/', {
+        'name': 'Новая', 'slug': f'new-category-{next(_sequence)}'
+    }
+
+
+def categories_delete(count):
+    title, = make_titles(1)
+    make_titles(count)
+    return f'/api/v1/categories/{title.category.slug}/', None
+
+
+def genres_list(count):
+    make_genres(count)
+    return '/api/v1/genres/', None
+
+
+def genres_create(count):
+    make_genres(count)
+    return '/api/v1/genres/', {
+        'name': 'Новый', 'slug': f'new-genre-{next(_sequence)}'
+    }
+
+
+def genres_delete(count):
+    genre, = make_genres(1)
+    from reviews.models import GenreTitle
+    GenreTitle.objects.bulk_create([
+        GenreTitle(title=title, genre=genre) for title in make_titles(count)
+    ])
+    return f'/api/v1/genres/{genre.slug}/', None
+
+
+def reviews_list(count):
+    title, = make_titles(1, reviews=count, comments=count)
+    return reviews_url(title), None
+
+
+def reviews_stats(count):
+    title, = make_titles(1, reviews=count)
+    return f'{reviews_url(title)}stats/', None
+
+
+def reviews_detail(count):
+    title, review = make_review(count)
+    return f'{reviews_url(title)}{review.id}/', None
+
+
+def reviews_create(count):
+    title, = make_titles(1, reviews=count, comments=count)
+    return reviews_url(title), {'text': 'Новый отзыв', 'score': 7}
+
+
+def reviews_update(count):
+    title, review = make_review(count)
+    return f'{reviews_url(title)}{review.id}/', {'score': 9}
+
+
+def reviews_delete(count):
+    title, review = make_review(count)
+    return f'{reviews_url(title)}{review.id}/', None
+
+
+def reviews_bulk(count):
+    titles = make_titles(count)
+    authors = make_users(count)
+    return '/api/v1/reviews/bulk/', [
+        {'title': title.id, 'author': author.username, 'text': 'Импорт',
+         'score': 6}
+        for title, author in zip(titles, authors)
+    ]
+
+
+def reviews_bulk_delete(count):
+    titles = make_titles(count, reviews=1, comments=count)
+    return '/api/v1/reviews/bulk/delete/', {
+        'author': titles[0].reviews.get().author.username
+    }
+
+
+def comments_bulk_delete(count):
+    _, review = make_review(count)
+    return '/api/v1/comments/bulk/delete/', {
+        'ids': list(review.comments.values_list('id', flat=True))
+    }
+
+
+def comments_list(count):
+    _, review = make_review(count)
+    return comments_url(review), None
+
+
+def comments_detail(count):
+    _, review = make_review(count)
+    return f'{comments_url(review)}{review.comments.first().id}/', None
+
+
+def comments_create(count):
+    _, review = make_review(count)
+    return comments_url(review), {'text': 'Новый комментарий'}
+
+
+def comments_update(count):
+    _, review = make_review(count)
+    comment = review.comments.first()
+    return f'{comments_url(review)}{comment.id}/', {'text': 'Исправлено'}
+
+
+def comments_delete(count):
+    _, review = make_review(count)
+    return f'{comments_url(review)}{review.comments.first().id}/', None
+
+
+def users_list(count):
+    make_users(count)
+    return '/api/v1/users/', None
+
+
+def users_search(count):
+    make_users(count)
+    return '/api/v1/users/?username=BUDGET_', None
+
+
+def users_create(count):
+    make_users(count)
+    suffix = next(_sequence)
+    return '/api/v1/users/', {
+        'username': f'new_user_{suffix}',
+        'email': f'new_user_{suffix}@yamdb.fake',
+    }
+
+
+def users_bulk(count):
+    suffix = next(_sequence)
+    return '/api/v1/users/bulk/', [
+        {'username': f'bulk_{suffix}_{i}',
+         'email': f'bulk_{suffix}_{i}@yamdb.fake'}
+        for i in range(count)
+    ]
+
+
+def users_bulk_role(count):
+    return '/api/v1/users/bulk/role/', {
+        'usernames': [user.username for user in make_users(count)],
+        'role': 'moderator',
+    }
+
+
+def users_detail(count):
+    return f'/api/v1/users/{make_users(count)[0].username}/', None
+
+
+def users_update(count):
+    user = make_users(count)[0]
+    return f'/api/v1/users/{user.username}/', {'bio': 'Новая биография'}
+
+
+def users_delete(count):
+    """Пользователь с отзывами и комментариями на count произведений."""
+    from reviews.models import Comment, Review
+
+    user = make_users(1)[0]
+    titles = make_titles(count, reviews=count)
+    Review.objects.bulk_create([
+        Review(title=title, author=user, text='Отзыв', score=3)
+        for title in titles
+    ])
+    Comment.objects.bulk_create([
+        Comment(review=review, author=user, text='Комментарий')
+        for review in Review.objects.filter(title__in=titles)
+    ])
+    return f'/api/v1/users/{user.username}/', None
+
+
+def me(count):
+    make_titles(count, reviews=count)
+    return '/api/v1/users/me/', None
+
+
+def me_update(count):
+    make_titles(count, reviews=count)
+    return '/api/v1/users/me/', {'bio': f'Обо мне {next(_sequence)}'}
+
+
+def signup(count):
+    make_users(count)
+    suffix = next(_sequence)
+    return '/api/v1/auth/signup/', {
+        'username': f'signup_{suffix}',
+        'email': f'signup_{suffix}@yamdb.fake',
+    }
+
+
+def token(count):
+    from users.models import User
+
+    user = make_users(count)[0]
+    User.objects.filter(id=user.id).update(confirmation_code='code')
+    return '/api/v1/auth/token/', {
+        'username': user.username, 'confirmation_code': 'code'
+    }
+
+
+def token_refresh(count):
+    from api.users.tokens import tokens_for
+
+    _, refresh = tokens_for(make_users(count)[0].id)
+    return '/api/v1/auth/token/refresh/', {'refresh': str(refresh)}
+
+
+def token_revoke(count):
+    from api.users.tokens import tokens_for
+
+    _, refresh = tokens_for(make_users(count)[0].id)
+    return '/api/v1/auth/token/revoke/', {'refresh': str(refresh)}
+
+
+# (эндпоинт, метод, клиент, подготовка данных)
+CASES = (
+    ('titles-list', 'GET', 'anon', titles_list),
+    ('titles-detail', 'GET', 'anon', titles_detail),
+    ('titles-list', 'POST', 'admin', titles_create),
+    ('titles-detail', 'PATCH', 'admin', titles_update),
+    ('titles-detail', 'DELETE', 'admin', titles_delete),
+    ('categories-list', 'GET', 'anon', categories_list),
+    ('categories-list', 'POST', 'admin', categories_create),
+    ('categories-detail', 'DELETE', 'admin', categories_delete),
+    ('genres-list', 'GET', 'anon', genres_list),
+    ('genres-list', 'POST', 'admin', genres_create),
+    ('genres-detail', 'DELETE', 'admin', genres_delete),
+    ('reviews-list', 'GET', 'anon', reviews_list),
+    ('reviews-stats', 'GET', 'anon', reviews_stats),
+    ('reviews-detail', 'GET', 'anon', reviews_detail),
+    ('reviews-list', 'POST', 'user', reviews_create),
+    ('reviews-detail', 'PATCH', 'admin', reviews_update),
+    ('reviews-detail', 'DELETE', 'admin', reviews_delete),
+    ('reviews-bulk', 'POST', 'admin', reviews_bulk),
+    ('reviews-bulk-delete', 'POST', 'admin', reviews_bulk_delete),
+    ('comments-list', 'GET', 'anon', comments_list),
+    ('comments-detail', 'GET', 'anon', comments_detail),
+    ('comments-list', 'POST', 'user', comments_create),
+    ('comments-detail', 'PATCH', 'admin', comments_update),
+    ('comments-detail', 'DELETE', 'admin', comments_delete),
+    ('comments-bulk-delete', 'POST', 'admin', comments_bulk_delete),
+    ('users-list', 'GET', 'admin', users_list),
+    ('users-search', 'GET', 'admin', users_search),
+    ('users-list', 'POST', 'admin', users_create),
+    ('users-bulk', 'POST', 'admin', users_bulk),
+    ('users-bulk-role', 'POST', 'admin', users_bulk_role),
+    ('users-detail', 'GET', 'admin', users_detail),
+    ('users-detail', 'PATCH', 'admin', users_update),
+    ('users-detail', 'DELETE', 'admin', users_delete),
+    ('users-me', 'GET', 'user', me),
+    ('users-me', 'PATCH', 'user', me_update),
+    ('signup', 'POST', 'anon', signup),
+    ('get_token', 'POST', 'anon', token),
+    ('token_refresh', 'POST', 'anon', token_refresh),
+    ('token_revoke', 'POST', 'anon', token_revoke),
+)
+
+
+@pytest.fixture(scope='module', autouse=True)
+def budget_report(request):
+    yield
+    plugins = request.config.pluginmanager
+    reporter = plugins.getplugin('terminalreporter')
+    if not _budgets or reporter is None:
+        return
+    with plugins.getplugin('capturemanager').global_and_fixture_disabled():
+        reporter.write_line('')
+        reporter.write_line(
+            f'{"эндпоинт":<20}{"метод":<8}{f"N={N}":>8}{f"N={10 * N}":>8}'
+        )
+        for (name, method), counts in _budgets.items():
+            reporter.write_line(
+                f'{name:<20}{method:<8}{counts[0]:>8}{counts[1]:>8}'
+            )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13QueryCounts:
+
+    @pytest.fixture
+    def clients(self, client, user_client, admin_client):
+        return {'anon': client, 'user': user_client, 'admin': admin_client}
+
+    def measure(self, client, method, url, data):
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(client, method.lower())(
+                url, data=data, format=None if data is None else 'json'
+            )
+        assert response.status_code < 400, (
+            f'Проверьте, что {method}-запрос к `{url}` выполняется успешно: '
+            f'получен ответ {response.status_code}.'
+        )
+        return len(queries)
+
+    @pytest.mark.parametrize(
+        'name, method, role, prepare', CASES,
+        ids=[f'{name}-{method}' for name, method, _, _ in CASES]
+    )
+    def test_query_budget(self, clients, name, method, role, prepare):
+        client = clients[role]
+        if role == 'anon':
+            client = APIClient()
+        counts = [
+            self.measure(client, method, *prepare(size))
+            for size in (N, 10 * N)
+        ]
+        _budgets[name, method] = counts
+        assert counts[0] == counts[1], (
+            f'Число SQL-запросов для {method} `{name}` растёт вместе с '
+            f'объёмом данных: {counts[0]} при N={N} и {counts[1]} при '
+            f'N={10 * N}. Проверьте, нет ли проблемы N+1.'
+        )
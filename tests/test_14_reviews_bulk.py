@@ -0,0 +1,94 @@
+from decimal import Decimal
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ReviewsBulk:
+
+    URL = '/api/v1/reviews/bulk/'
+
+    def test_01_bulk_create(self, admin_client, admin, user, moderator):
+        from reviews.models import Review, Title
+
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        data = [
+            {'title': first, 'author': user.username, 'text': 'a', 'score': 4},
+            {'title': first, 'author': admin.username, 'text': 'b',
+             'score': 7},
+            {'title': second, 'author': moderator.username, 'text': 'c',
+             'score': 9},
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.post(self.URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос администратора к `{self.URL}` с '
+            'корректными данными возвращает ответ со статусом 201.'
+        )
+        assert response.json() == {'created': 3}
+        assert Review.objects.count() == 3
+        assert Title.objects.get(id=first).rating == Decimal('5.5'), (
+            'Проверьте, что после массового создания отзывов рейтинг '
+            'произведений пересчитывается.'
+        )
+        assert Title.objects.get(id=second).rating == 9
+        updates = [
+            query for query in queries.captured_queries
+            if query['sql'].startswith('UPDATE')
+        ]
+        assert len(updates) == 1, (
+            'Проверьте, что рейтинги всех затронутых произведений '
+            'обновляются одним запросом.'
+        )
+
+    def test_02_bulk_validation(self, admin_client, user_client, admin,
+                                user):
+        from reviews.models import Review
+
+        titles, _, _ = create_titles(admin_client)
+        title = titles[0]['id']
+        Review.objects.create(
+            title_id=title, author=user, text='old', score=5
+        )
+        data = [
+            {'title': title, 'author': admin.username, 'text': 'a',
+             'score': 5},
+            {'title': title, 'author': user.username, 'text': 'b',
+             'score': 5},
+            {'title': title, 'author': admin.username, 'text': 'c',
+             'score': 5},
+            {'title': 0, 'author': 'nobody', 'text': 'd', 'score': 5},
+            {'title': title, 'author': admin.username, 'text': 'e',
+             'score': 11},
+        ]
+        response = admin_client.post(
+            self.URL, data=data[:4], format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert errors[0] == {}
+        assert 'non_field_errors' in errors[1], (
+            'Проверьте, что повтор существующего отзыва отклоняется.'
+        )
+        assert 'non_field_errors' in errors[2], (
+            'Проверьте, что повтор пары произведение-автор внутри пакета '
+            'отклоняется.'
+        )
+        assert set(errors[3]) == {'title', 'author'}
+        assert Review.objects.count() == 1, (
+            'Проверьте, что при ошибке в пакете отзывы не создаются.'
+        )
+
+        response = admin_client.post(self.URL, data=data[4:], format='json')
+        assert 'score' in response.json()[0]
+
+        response = user_client.post(self.URL, data=data[:1], format='json')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что `{self.URL}` доступен только администратору.'
+        )
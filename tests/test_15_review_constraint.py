@@ -0,0 +1,51 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15ReviewConstraint:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_duplicate_rejected_by_constraint(self, admin_client,
+                                                 user_client):
+        from reviews.models import Review
+
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        data = {'text': 'Отзыв', 'score': 6}
+
+        with CaptureQueriesContext(connection) as queries:
+            response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        assert not any(
+            query['sql'].startswith('SELECT 1 AS')
+            for query in queries.captured_queries
+        ), (
+            'Проверьте, что перед созданием отзыва не выполняется проверка '
+            'exists(): повтор должен отклоняться ограничением '
+            '`unique_review`.'
+        )
+
+        response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторный отзыв того же автора на то же '
+            'произведение возвращает ответ со статусом 400.'
+        )
+        assert response.json() == {
+            'detail': ['Вы уже оставляли отзыв на это произведение']
+        }
+        assert Review.objects.count() == 1
+
+        response = user_client.post(url, data={'text': 'Другой', 'score': 2})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert admin_client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/'
+        ).json()['rating'] == 6, (
+            'Проверьте, что отклонённый повтор не меняет рейтинг.'
+        )
@@ -0,0 +1,83 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16ReviewStats:
+
+    STATS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/stats/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_stats(self, client, title_id):
+        response = client.get(self.STATS_URL_TEMPLATE.format(
+            title_id=title_id
+        ))
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.STATS_URL_TEMPLATE}` '
+            'возвращает ответ со статусом 200.'
+        )
+        return response.json()
+
+    def test_01_stats(self, client, admin_client, user_client,
+                      moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        assert self.get_stats(client, title_id) == {
+            'count': 0, 'average': None, 'histogram': [0] * 10
+        }, 'Проверьте статистику произведения без отзывов.'
+
+        review = create_single_review(user_client, title_id, 'a', 3).json()
+        create_single_review(moderator_client, title_id, 'b', 8)
+        create_single_review(admin_client, title_id, 'c', 8)
+        stats = self.get_stats(client, title_id)
+        assert stats['count'] == 3
+        assert stats['average'] == 6.33
+        assert stats['histogram'] == [0, 0, 1, 0, 0, 0, 0, 2, 0, 0], (
+            'Проверьте, что гистограмма содержит число оценок 1, 2, ..., 10.'
+        )
+
+        url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review['id']
+        )
+        user_client.patch(url, data={'score': 10})
+        stats = self.get_stats(client, title_id)
+        assert stats['histogram'] == [0, 0, 0, 0, 0, 0, 0, 2, 0, 1], (
+            'Проверьте, что при изменении оценки статистика обновляется.'
+        )
+        admin_client.delete(url)
+        stats = self.get_stats(client, title_id)
+        assert stats['count'] == 2
+        assert stats['histogram'] == [0, 0, 0, 0, 0, 0, 0, 2, 0, 0], (
+            'Проверьте, что при удалении отзыва статистика обновляется.'
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            self.get_stats(client, title_id)
+        assert len(queries) == 1, (
+            'Проверьте, что статистика читается одним запросом.'
+        )
+
+        response = client.get(self.STATS_URL_TEMPLATE.format(title_id=0))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_stats_after_bulk_create(self, client, admin_client, admin,
+                                        user):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        admin_client.post('/api/v1/reviews/bulk/', data=[
+            {'title': title_id, 'author': admin.username, 'text': 'a',
+             'score': 1},
+            {'title': title_id, 'author': user.username, 'text': 'b',
+             'score': 2},
+        ], format='json')
+        stats = self.get_stats(client, title_id)
+        assert stats['histogram'][:2] == [1, 1], (
+            'Проверьте, что массовое создание отзывов обновляет статистику.'
+        )
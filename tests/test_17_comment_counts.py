@@ -0,0 +1,70 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17CommentCounts:
+
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def test_01_comment_count(self, admin_client, admin, user_client, user,
+                              moderator_client, moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        response = admin_client.get(url)
+        assert response.json().get('comment_count') == len(comments), (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит поле '
+            '`comment_count` с числом комментариев к отзыву.'
+        )
+
+        admin_client.delete(f'{url}comments/{comments[0]["id"]}/')
+        response = admin_client.get(url)
+        assert response.json()['comment_count'] == len(comments) - 1, (
+            'Проверьте, что при удалении комментария `comment_count` '
+            'уменьшается.'
+        )
+
+        response = admin_client.patch(url, data={'comment_count': 100})
+        assert response.json()['comment_count'] == len(comments) - 1, (
+            'Проверьте, что поле `comment_count` доступно только для чтения.'
+        )
+
+        admin_client.delete(f'/api/v1/users/{moderator.username}/')
+        response = admin_client.get(url)
+        assert response.json()['comment_count'] == len(comments) - 2, (
+            'Проверьте, что при удалении пользователя число комментариев '
+            'к отзывам, которые он комментировал, пересчитывается.'
+        )
+
+    def test_02_repair_command(self, admin_client, admin, user_client, user):
+        from reviews.models import Review
+
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, _ = create_comments(admin_client, author_map)
+        Review.objects.update(comment_count=7)
+
+        out = StringIO()
+        call_command('repair_comment_counts', dry_run=True, stdout=out)
+        assert 'расхождений: 2' in out.getvalue()
+        assert Review.objects.filter(comment_count=7).count() == 2, (
+            'Проверьте, что в режиме --dry-run счётчики не меняются.'
+        )
+
+        call_command('repair_comment_counts', batch_size=1, stdout=out)
+        counts = dict(Review.objects.values_list('id', 'comment_count'))
+        assert counts == {
+            reviews[0]['id']: len(comments), reviews[1]['id']: 0
+        }, 'Проверьте, что команда восстанавливает число комментариев.'
@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18TitleActivity:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def get_title(self, client, title_id):
+        return client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        ).json()
+
+    def test_01_review_count(self, client, admin_client, user_client,
+                             moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        title = self.get_title(client, title_id)
+        assert title.get('review_count') == 0, (
+            'Проверьте, что ответ на GET-запрос к '
+            f'`{self.TITLE_DETAIL_URL_TEMPLATE}` содержит поле '
+            '`review_count`.'
+        )
+        assert 'last_review_at' in title and title['last_review_at'] is None
+
+        first = create_single_review(user_client, title_id, 'a', 4).json()
+        with CaptureQueriesContext(connection) as queries:
+            second = create_single_review(
+                moderator_client, title_id, 'b', 9
+            ).json()
+        title_updates = [
+            query for query in queries.captured_queries
+            if query['sql'].startswith('UPDATE "reviews_title"')
+        ]
+        assert len(title_updates) == 1, (
+            'Проверьте, что рейтинг, число отзывов и дата последнего отзыва '
+            'обновляются одним запросом.'
+        )
+        title = self.get_title(client, title_id)
+        assert title['review_count'] == 2
+        assert title['rating'] == 6
+        assert title['last_review_at'] == second['pub_date'], (
+            'Проверьте, что `last_review_at` совпадает с датой последнего '
+            'отзыва.'
+        )
+
+        admin_client.delete(
+            f'/api/v1/titles/{title_id}/reviews/{second["id"]}/'
+        )
+        title = self.get_title(client, title_id)
+        assert title['review_count'] == 1
+        assert title['last_review_at'] == first['pub_date'], (
+            'Проверьте, что при удалении отзыва `last_review_at` '
+            'пересчитывается.'
+        )
+
+    def test_02_ordering(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[1]['id'], 'a', 5)
+        response = client.get('/api/v1/titles/?ordering=-review_count')
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert [title['id'] for title in results] == [
+            titles[1]['id'], titles[0]['id']
+        ], 'Проверьте сортировку произведений по числу отзывов.'
+
+        response = client.get('/api/v1/titles/?ordering=last_review_at')
+        assert response.status_code == HTTPStatus.OK
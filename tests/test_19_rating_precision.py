@@ -0,0 +1,72 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19RatingPrecision:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def get_rating(self, client, title_id, rating_format=None):
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        if rating_format:
+            url += f'?rating_format={rating_format}'
+        return client.get(url).json()['rating']
+
+    def test_01_rating_formats(self, client, admin_client, user_client,
+                               moderator_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        assert self.get_rating(client, title_id, 'decimal') is None
+
+        create_single_review(user_client, title_id, 'a', 8)
+        create_single_review(moderator_client, title_id, 'b', 7)
+        review = create_single_review(admin_client, title_id, 'c', 8).json()
+        assert self.get_rating(client, title_id) == 7, (
+            'Проверьте, что по умолчанию рейтинг возвращается целым числом, '
+            'как раньше.'
+        )
+        assert self.get_rating(client, title_id, 'decimal') == 7.67, (
+            'Проверьте, что при `?rating_format=decimal` возвращается '
+            'точный рейтинг, округлённый до `RATING_DECIMAL_PLACES` знаков.'
+        )
+
+        admin_client.patch(
+            f'/api/v1/titles/{title_id}/reviews/{review["id"]}/',
+            data={'score': 10}
+        )
+        assert self.get_rating(client, title_id, 'decimal') == 8.33, (
+            'Проверьте, что при изменении оценки рейтинг пересчитывается.'
+        )
+        admin_client.delete(
+            f'/api/v1/titles/{title_id}/reviews/{review["id"]}/'
+        )
+        assert self.get_rating(client, title_id, 'decimal') == 7.5
+        title = Title.objects.get(id=title_id)
+        assert (title.score_sum, title.review_count) == (15, 2)
+
+        Title.objects.filter(id=title_id).update(
+            rating=None, score_sum=0, review_count=0
+        )
+        Title.objects.filter(id=title_id).update_ratings()
+        assert self.get_rating(client, title_id, 'decimal') == 7.5, (
+            'Проверьте, что пакетный пересчёт даёт тот же рейтинг.'
+        )
+
+    def test_02_no_extra_queries(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'a', 3)
+        counts = []
+        for rating_format in ('integer', 'decimal'):
+            with CaptureQueriesContext(connection) as queries:
+                client.get(f'/api/v1/titles/?rating_format={rating_format}')
+            counts.append(len(queries))
+        assert counts[0] == counts[1], (
+            'Проверьте, что точный рейтинг не требует дополнительных '
+            'запросов.'
+        )
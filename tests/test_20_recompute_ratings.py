@@ -0,0 +1,67 @@
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20RecomputeRatings:
+
+    def snapshot(self):
+        from reviews.models import Title
+
+        return {
+            values[0]: values[1:] for values in Title.objects.values_list(
+                'id', 'rating', 'score_sum', 'review_count', 'last_review_at'
+            )
+        }
+
+    def test_01_recompute(self, admin_client, user_client, moderator_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'a', 8)
+        create_single_review(moderator_client, title_id, 'b', 3)
+        expected = self.snapshot()
+        assert expected[title_id][:3] == (Decimal('5.5'), 11, 2)
+
+        Title.objects.update(
+            rating=1, score_sum=1, review_count=1, last_review_at=None
+        )
+        out = StringIO()
+        call_command('recompute_ratings', dry_run=True, stdout=out,
+                     stderr=StringIO())
+        assert 'расхождений: 2' in out.getvalue()
+        assert f'title {title_id}: score_sum 1 -> 11' in out.getvalue(), (
+            'Проверьте, что в режиме --dry-run команда выводит расхождения.'
+        )
+        assert Title.objects.filter(score_sum=1).count() == 2, (
+            'Проверьте, что в режиме --dry-run агрегаты не меняются.'
+        )
+
+        out = StringIO()
+        call_command('recompute_ratings', batch_size=1, stdout=out,
+                     stderr=StringIO())
+        assert 'исправлено: 2' in out.getvalue()
+        assert self.snapshot() == expected, (
+            'Проверьте, что команда `recompute_ratings` восстанавливает '
+            'рейтинг, сумму и число оценок и дату последнего отзыва.'
+        )
+
+        out = StringIO()
+        call_command('recompute_ratings', dry_run=True, stdout=out,
+                     stderr=StringIO())
+        assert 'расхождений: 0' in out.getvalue(), (
+            'Проверьте, что после пересчёта расхождений не остаётся.'
+        )
+
+    def test_02_split_range(self):
+        from reviews.management.commands.recompute_ratings import split_range
+
+        assert split_range(1, 10, 3) == [(1, 4), (5, 8), (9, 10)]
+        assert split_range(5, 6, 4) == [(5, 5), (6, 6)]
+        assert split_range(7, 7, 1) == [(7, 7)]
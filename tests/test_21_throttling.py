@@ -0,0 +1,96 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21Throttling:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+
+    @pytest.fixture(autouse=True)
+    def low_rates(self, monkeypatch):
+        from api.core.throttles import SignupThrottle, TokenThrottle
+
+        rates = {'signup': '3/min', 'token': '3/min'}
+        monkeypatch.setattr(SignupThrottle, 'THROTTLE_RATES', rates)
+        monkeypatch.setattr(TokenThrottle, 'THROTTLE_RATES', rates)
+        cache.clear()
+        yield
+        cache.clear()
+
+    def signup(self, client, number, **extra):
+        return client.post(self.URL_SIGNUP, data={
+            'username': f'throttled_{number}',
+            'email': f'throttled_{number}@yamdb.fake',
+        }, **extra)
+
+    def test_01_signup_by_ip(self, client):
+        for number in range(3):
+            assert self.signup(client, number).status_code == HTTPStatus.OK
+        with CaptureQueriesContext(connection) as queries:
+            response = self.signup(client, 3)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что число POST-запросов к `{self.URL_SIGNUP}` с '
+            'одного IP ограничено.'
+        )
+        assert 'Retry-After' in response
+        assert not queries.captured_queries, (
+            'Проверьте, что ограничение частоты срабатывает до обращения '
+            'к базе данных.'
+        )
+        other_ip = self.signup(client, 4, REMOTE_ADDR='10.0.0.2')
+        assert other_ip.status_code == HTTPStatus.OK, (
+            'Проверьте, что лимит по IP считается отдельно для каждого '
+            'адреса.'
+        )
+
+    def test_02_signup_by_username(self, client):
+        for number in range(3):
+            self.signup(client, 0, REMOTE_ADDR=f'10.0.1.{number}')
+        response = self.signup(client, 0, REMOTE_ADDR='10.0.1.100')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что повторные запросы регистрации одного username '
+            'с разных IP тоже ограничены.'
+        )
+
+    def test_03_token(self, client, user):
+        data = {'username': user.username, 'confirmation_code': 'wrong'}
+        for number in range(3):
+            response = client.post(
+                self.URL_TOKEN, data=data, REMOTE_ADDR=f'10.0.2.{number}'
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = client.post(
+            self.URL_TOKEN, data=data, REMOTE_ADDR='10.0.2.100'
+        )
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что подбор кода подтверждения для одного username '
+            f'через `{self.URL_TOKEN}` ограничен.'
+        )
+
+    def test_04_sliding_window(self, monkeypatch):
+        from types import SimpleNamespace
+
+        from api.core.throttles import SignupThrottle
+
+        now = [120.0]
+        monkeypatch.setattr(SignupThrottle, 'timer', lambda self: now[0])
+        request = SimpleNamespace(
+            data={}, META={'REMOTE_ADDR': '10.0.3.1'}
+        )
+
+        def allowed():
+            return SignupThrottle().allow_request(request, None)
+
+        assert [allowed() for _ in range(4)] == [True, True, True, False]
+        # Через половину окна предыдущее окно весит 1.5 запроса.
+        now[0] = 210.0
+        assert [allowed() for _ in range(3)] == [True, True, False]
+        # Ещё через окно все запросы первого окна выходят из расчёта.
+        now[0] = 300.0
+        assert allowed()
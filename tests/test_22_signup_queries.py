@@ -0,0 +1,72 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22SignupQueries:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def signup(self, client, username, email):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(
+                self.URL_SIGNUP, data={'username': username, 'email': email}
+            )
+        statements = [query['sql'] for query in queries.captured_queries]
+        selects = [sql for sql in statements if sql.startswith('SELECT')]
+        writes = [
+            sql for sql in statements if sql.startswith(('INSERT', 'UPDATE'))
+        ]
+        return response, len(selects), writes
+
+    def test_01_new_user(self, client, django_user_model):
+        response, count, writes = self.signup(
+            client, 'newcomer', 'newcomer@yamdb.fake'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert count == 1 and len(writes) == 1, (
+            'Проверьте, что регистрация нового пользователя выполняет один '
+            'SELECT и один INSERT.'
+        )
+        user = django_user_model.objects.get(username='newcomer')
+        assert user.confirmation_code != '[][][][][]', (
+            'Проверьте, что новому пользователю сохраняется код '
+            'подтверждения.'
+        )
+
+    def test_02_existing_user(self, client, django_user_model, mailoutbox):
+        self.signup(client, 'returning', 'returning@yamdb.fake')
+        response, count, writes = self.signup(
+            client, 'returning', 'returning@yamdb.fake'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert count == 1 and len(writes) == 1, (
+            'Проверьте, что повторная регистрация выполняет один SELECT '
+            'и один UPDATE кода подтверждения.'
+        )
+        code = django_user_model.objects.get(
+            username='returning'
+        ).confirmation_code
+        assert code in mailoutbox[-1].body, (
+            'Проверьте, что в письме отправляется сохранённый код '
+            'подтверждения.'
+        )
+
+    def test_03_conflicts(self, client, user):
+        response, _, _ = self.signup(
+            client, user.username, 'other@yamdb.fake'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'email' in response.json()
+        response, count, writes = self.signup(
+            client, 'somebody_else', user.email
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'email' in response.json()
+        assert count == 1 and not writes, (
+            'Проверьте, что конфликт username и email определяется одним '
+            'запросом без записи в базу.'
+        )
@@ -0,0 +1,55 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23TokenEndpoint:
+
+    URL_TOKEN = '/api/v1/auth/token/'
+
+    @pytest.fixture
+    def confirmed_user(self, user):
+        user.confirmation_code = 'secret-code'
+        user.save(update_fields=['confirmation_code'])
+        return user
+
+    def test_01_token(self, client, confirmed_user):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(self.URL_TOKEN, data={
+                'username': confirmed_user.username,
+                'confirmation_code': 'secret-code',
+            })
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(queries) == 1, (
+            f'Проверьте, что `{self.URL_TOKEN}` выдаёт токен одним '
+            'запросом к базе данных.'
+        )
+        assert '"bio"' not in queries.captured_queries[0]['sql'], (
+            'Проверьте, что из базы выбираются только нужные столбцы.'
+        )
+
+        token = response.json()['token']
+        assert AccessToken(token)['user_id'] == confirmed_user.id
+        authorized = APIClient()
+        authorized.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        response = authorized.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что выданный токен принимается API.'
+        )
+        assert response.json()['username'] == confirmed_user.username
+
+    def test_02_wrong_code(self, client, confirmed_user):
+        for code in ('secret-cod', 'secret-code-', 'SECRET-CODE'):
+            response = client.post(self.URL_TOKEN, data={
+                'username': confirmed_user.username,
+                'confirmation_code': code,
+            })
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что `{self.URL_TOKEN}` отклоняет неверный код '
+                'подтверждения.'
+            )
@@ -0,0 +1,148 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24TokenRefresh:
+
+    URL_TOKEN = '/api/v1/auth/token/'
+    URL_REFRESH = '/api/v1/auth/token/refresh/'
+    URL_REVOKE = '/api/v1/auth/token/revoke/'
+
+    @pytest.fixture
+    def tokens(self, client, user):
+        cache.clear()
+        user.confirmation_code = 'secret-code'
+        user.save(update_fields=['confirmation_code'])
+        response = client.post(self.URL_TOKEN, data={
+            'username': user.username, 'confirmation_code': 'secret-code'
+        })
+        assert response.status_code == HTTPStatus.CREATED
+        assert 'refresh' in response.json(), (
+            f'Проверьте, что `{self.URL_TOKEN}` возвращает и refresh-токен.'
+        )
+        return response.json()
+
+    def refresh(self, client, token):
+        return client.post(self.URL_REFRESH, data={'refresh': token})
+
+    def test_01_refresh(self, client, user, tokens):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.refresh(client, tokens['refresh'])
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что POST-запрос к `{self.URL_REFRESH}` с '
+            'действующим refresh-токеном возвращает ответ со статусом 200.'
+        )
+        assert not queries.captured_queries, (
+            'Проверьте, что обновление токена не обращается к базе данных.'
+        )
+        data = response.json()
+        assert data['refresh'] != tokens['refresh'], (
+            'Проверьте, что при обновлении выдаётся новый refresh-токен.'
+        )
+        authorized = APIClient()
+        authorized.credentials(HTTP_AUTHORIZATION=f'Bearer {data["token"]}')
+        response = authorized.get('/api/v1/users/me/')
+        assert response.json()['username'] == user.username
+
+        assert self.refresh(client, data['refresh']).status_code == (
+            HTTPStatus.OK
+        )
+
+    def test_02_rotation(self, client, tokens):
+        self.refresh(client, tokens['refresh'])
+        response = self.refresh(client, tokens['refresh'])
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что использованный refresh-токен повторно не '
+            'принимается.'
+        )
+
+    def test_03_invalid(self, client, tokens):
+        for token in ('', 'not-a-token', tokens['token']):
+            response = self.refresh(client, token)
+            assert response.status_code in (
+                HTTPStatus.BAD_REQUEST, HTTPStatus.UNAUTHORIZED
+            ), (
+                f'Проверьте, что `{self.URL_REFRESH}` отклоняет пустой, '
+                'испорченный и access-токен.'
+            )
+
+    def test_04_session_lifetime(self, client, user, tokens, settings):
+        from rest_framework_simplejwt.tokens import RefreshToken
+
+        from api.users.tokens import tokens_for
+
+        first = RefreshToken(tokens['refresh'])
+        data = self.refresh(client, tokens['refresh']).json()
+        rotated = RefreshToken(data['refresh'])
+        assert rotated['orig_iat'] == first['orig_iat'], (
+            'Проверьте, что новый refresh-токен сохраняет время входа.'
+        )
+        lifetime = int(settings.JWT_SESSION_LIFETIME.total_seconds())
+        assert rotated['exp'] <= rotated['orig_iat'] + lifetime
+
+        _, old = tokens_for(user.id, orig_iat=first['orig_iat'] - lifetime)
+        response = self.refresh(client, str(old))
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что refresh-токен сессии старше '
+            '`JWT_SESSION_LIFETIME` не принимается.'
+        )
+
+    def test_05_inactive_user(self, client, user, tokens, admin_client,
+                              django_user_model):
+        from api.users.tokens import tokens_for
+
+        user.is_active = False
+        user.save(update_fields=['is_active'])
+        response = self.refresh(client, tokens['refresh'])
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что заблокированный пользователь не может обновить '
+            'токен.'
+        )
+
+        gone = django_user_model.objects.create(
+            username='gone', email='gone@yamdb.fake'
+        )
+        _, refresh = tokens_for(gone.id)
+        response = admin_client.delete(f'/api/v1/users/{gone.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        response = self.refresh(client, str(refresh))
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что удалённый пользователь не может обновить токен.'
+        )
+
+    def test_06_revoke(self, client, tokens):
+        response = client.post(self.URL_REVOKE,
+                               data={'refresh': tokens['refresh']})
+        assert response.status_code == HTTPStatus.NO_CONTENT, (
+            f'Проверьте, что POST-запрос к `{self.URL_REVOKE}` с '
+            'refresh-токеном возвращает ответ со статусом 204.'
+        )
+        response = self.refresh(client, tokens['refresh'])
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что отозванный refresh-токен не принимается.'
+        )
+        response = client.post(self.URL_REVOKE, data={'refresh': 'broken'})
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_07_local_cache(self, client, tokens, settings):
+        from api.users.tokens import check_denylist_cache
+
+        settings.JWT_DENYLIST_CACHE = 'default'
+        assert [error.id for error in check_denylist_cache(None)] == [
+            'api.E001'
+        ], (
+            'Проверьте, что системная проверка сообщает о списке отозванных '
+            'токенов в кэше процесса.'
+        )
+        with pytest.raises(ImproperlyConfigured):
+            self.refresh(client, tokens['refresh'])
+
+        settings.DEBUG = True
+        assert check_denylist_cache(None) == []
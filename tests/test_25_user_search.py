@@ -0,0 +1,103 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25UserSearch:
+
+    USERS_URL = '/api/v1/users/'
+
+    @pytest.fixture
+    def people(self, django_user_model):
+        names = ['Alice', 'alina', 'ALEX', 'Bob', 'Ålesund', 'al_pha']
+        django_user_model.objects.bulk_create([
+            django_user_model(username=name, email=f'{name.lower()}@mail.fake')
+            for name in names
+        ])
+        return names
+
+    def usernames(self, response):
+        return [user['username'] for user in response.json()['results']]
+
+    def test_01_username_prefix(self, admin_client, people):
+        response = admin_client.get(f'{self.USERS_URL}?username=aL')
+        assert response.status_code == HTTPStatus.OK
+        assert self.usernames(response) == ['Alice', 'alina', 'ALEX',
+                                            'al_pha'], (
+            f'Проверьте, что `{self.USERS_URL}?username=` ищет '
+            'пользователей по началу username без учёта регистра.'
+        )
+        response = admin_client.get(f'{self.USERS_URL}?username=åle')
+        assert self.usernames(response) == ['Ålesund']
+
+    def test_02_email_prefix(self, admin_client, people):
+        response = admin_client.get(f'{self.USERS_URL}?email=bob@')
+        assert self.usernames(response) == ['Bob'], (
+            f'Проверьте, что `{self.USERS_URL}?email=` ищет пользователей '
+            'по началу email.'
+        )
+
+    def test_03_uses_index(self, admin_client, people):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'EXPLAIN QUERY PLAN SELECT id FROM users_user '
+                'WHERE username_lower >= %s AND username_lower < %s',
+                ['al', 'am']
+            )
+            plan = ' '.join(str(row) for row in cursor.fetchall())
+        assert 'USING' in plan and 'INDEX' in plan, (
+            'Проверьте, что поиск по началу username использует индекс.'
+        )
+
+    def test_04_keyset_pagination(self, admin_client, django_user_model):
+        django_user_model.objects.bulk_create([
+            django_user_model(username=f'page_{i:02}',
+                              email=f'page_{i}@mail.fake')
+            for i in range(25)
+        ])
+        url = f'{self.USERS_URL}?username=page_'
+        seen = []
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = admin_client.get(url)
+            assert not any(
+                'COUNT(' in query['sql'] or 'OFFSET' in query['sql']
+                for query in queries.captured_queries
+            ), 'Проверьте, что поиск по префиксу не считает COUNT и OFFSET.'
+            data = response.json()
+            assert 'count' not in data
+            seen.extend(self.usernames(response))
+            url = data['next']
+        assert seen == [f'page_{i:02}' for i in range(25)], (
+            'Проверьте, что страницы поиска по префиксу идут по возрастанию '
+            'id без пропусков и повторов.'
+        )
+
+        response = admin_client.get(self.USERS_URL)
+        assert response.json()['count'] == 26, (
+            f'Проверьте, что обычный список `{self.USERS_URL}` по-прежнему '
+            'содержит `count`.'
+        )
+
+    def test_05_username_change(self, admin_client, user):
+        response = admin_client.patch(
+            f'{self.USERS_URL}{user.username}/', data={'username': 'Renamed'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = admin_client.get(f'{self.USERS_URL}?username=rena')
+        assert self.usernames(response) == ['Renamed'], (
+            'Проверьте, что после смены username поиск по префиксу находит '
+            'пользователя по новому имени.'
+        )
+
+    def test_06_empty_params(self, admin_client, people):
+        for params in ('username=', 'email=', 'cursor=', 'username=&email='):
+            response = admin_client.get(f'{self.USERS_URL}?{params}')
+            assert response.status_code == HTTPStatus.OK
+            assert response.json().get('count') == len(people) + 1, (
+                f'Проверьте, что `{self.USERS_URL}?{params}` с пустым '
+                'значением отдаёт обычный список с `count`.'
+            )
@@ -0,0 +1,199 @@
+import json
+from http import HTTPStatus
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+USERS_CSV = (
+    Path(__file__).resolve().parent.parent
+    / 'api_yamdb' / 'static' / 'data' / 'users.csv'
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26UsersBulk:
+
+    BULK_URL = '/api/v1/users/bulk/'
+    ROLE_URL = '/api/v1/users/bulk/role/'
+
+    def payload(self, count, prefix='bulk'):
+        return [
+            {'username': f'{prefix}_{i}', 'email': f'{prefix}_{i}@yamdb.fake',
+             'role': 'moderator' if i % 2 else 'user'}
+            for i in range(count)
+        ]
+
+    def test_01_bulk_create(self, admin_client, django_user_model):
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.post(
+                self.BULK_URL, data=self.payload(20), format='json'
+            )
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос администратора к `{self.BULK_URL}` '
+            'с корректными данными возвращает ответ со статусом 201.'
+        )
+        assert response.json() == {'created': 20}
+        assert django_user_model.objects.filter(
+            username__startswith='bulk_', role='moderator'
+        ).count() == 10
+        inserts = [
+            query for query in queries.captured_queries
+            if query['sql'].startswith('INSERT')
+        ]
+        assert len(inserts) == 1, (
+            'Проверьте, что пользователи создаются одним bulk_create.'
+        )
+        assert len(queries) < 10
+
+    def test_02_bulk_validation(self, admin_client, user_client, admin,
+                                django_user_model):
+        assert user_client.post(
+            self.BULK_URL, data=self.payload(1), format='json'
+        ).status_code == HTTPStatus.FORBIDDEN
+
+        data = self.payload(3) + [
+            {'username': 'me', 'email': 'me@yamdb.fake'},
+            {'username': 'bad name', 'email': 'bad@yamdb.fake'},
+            {'username': admin.username, 'email': 'new@yamdb.fake'},
+            {'username': 'fresh', 'email': admin.email},
+            {'username': 'bulk_0', 'email': 'twice@yamdb.fake'},
+        ]
+        response = admin_client.post(self.BULK_URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert [sorted(error) for error in errors] == [
+            [], [], [], ['username'], ['username'], [], [], [],
+        ], (
+            'Проверьте, что username проверяется валидаторами модели для '
+            'каждого пользователя пакета.'
+        )
+
+        response = admin_client.post(
+            self.BULK_URL, data=data[:3] + data[5:], format='json'
+        )
+        assert [sorted(error) for error in response.json()] == [
+            [], [], [], ['username'], ['email'], ['username'],
+        ], (
+            'Проверьте, что занятые username и email, в том числе внутри '
+            'пакета, возвращаются как ошибки отдельных пользователей.'
+        )
+        assert not django_user_model.objects.filter(
+            username__startswith='bulk_'
+        ).exists(), 'Проверьте, что пакет с ошибками не создаётся частично.'
+
+    def test_03_bulk_role(self, admin_client, django_user_model):
+        admin_client.post(self.BULK_URL, data=self.payload(5), format='json')
+        usernames = [f'bulk_{i}' for i in range(5)] + ['missing']
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.post(self.ROLE_URL, data={
+                'usernames': usernames, 'role': 'admin'
+            }, format='json')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {'updated': 5}
+        assert django_user_model.objects.filter(
+            username__startswith='bulk_', role='admin'
+        ).count() == 5
+        updates = [
+            query for query in queries.captured_queries
+            if query['sql'].startswith('UPDATE')
+        ]
+        assert len(updates) == 1, (
+            'Проверьте, что роль меняется одним UPDATE.'
+        )
+        response = admin_client.post(self.ROLE_URL, data={
+            'usernames': usernames, 'role': 'superhero'
+        }, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_import_command(self, tmp_path, django_user_model):
+        out, err = StringIO(), StringIO()
+        call_command('import_users', str(USERS_CSV), batch_size=2,
+                     stdout=out, stderr=err)
+        with open(USERS_CSV, encoding='utf-8') as file:
+            rows = sum(1 for _ in file) - 1
+        assert f'создано: {rows}' in out.getvalue()
+        assert django_user_model.objects.count() == rows
+
+        path = tmp_path / 'users.json'
+        path.write_text(json.dumps(
+            self.payload(2, 'json') + [{'username': 'me', 'email': 'x@y.z'}]
+        ))
+        out = StringIO()
+        call_command('import_users', str(path), stdout=out, stderr=err)
+        assert 'создано: 2, пропущено: 1' in out.getvalue(), (
+            'Проверьте, что команда `import_users` пропускает ошибочные '
+            'строки и создаёт остальных пользователей.'
+        )
+        assert 'row 3' in err.getvalue()
+
+    def test_05_import_race(self, tmp_path, monkeypatch, django_user_model):
+        from api.users.serializers import UserBulkListSerializer
+
+        validate = UserBulkListSerializer.to_internal_value
+
+        def validate_before_race(serializer, data):
+            items = validate(serializer, data)
+            # Пользователь зарегистрировался между проверкой и вставкой.
+            django_user_model.objects.create(
+                username='race_1', email='race_1@yamdb.fake'
+            )
+            return items
+
+        monkeypatch.setattr(
+            UserBulkListSerializer, 'to_internal_value', validate_before_race
+        )
+        path = tmp_path / 'users.json'
+        path.write_text(json.dumps(self.payload(3, 'race')))
+        out, err = StringIO(), StringIO()
+        call_command('import_users', str(path), stdout=out, stderr=err)
+        assert 'создано: 0, пропущено: 3' in out.getvalue(), (
+            'Проверьте, что команда `import_users` пропускает пачку, '
+            'вставка которой нарушила ограничение уникальности.'
+        )
+        assert 'rows 1-3' in err.getvalue()
+        assert list(django_user_model.objects.values_list(
+            'username', flat=True
+        )) == ['race_1']
+
+    def test_06_no_default_code(self, admin_client, client, tmp_path,
+                                django_user_model):
+        default_code = django_user_model._meta.get_field(
+            'confirmation_code'
+        ).default
+        admin_client.post(self.BULK_URL, data=self.payload(1), format='json')
+        path = tmp_path / 'users.json'
+        path.write_text(json.dumps(self.payload(1, 'imported')))
+        call_command('import_users', str(path), stdout=StringIO())
+
+        for username in ('bulk_0', 'imported_0'):
+            response = client.post('/api/v1/auth/token/', data={
+                'username': username, 'confirmation_code': default_code
+            })
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                'Проверьте, что для пользователей, созданных массово, код '
+                'подтверждения по умолчанию не даёт получить токен.'
+            )
+
+    def test_07_reserved_username(self, admin_client, client):
+        response = client.post('/api/v1/auth/signup/', data={
+            'username': 'bulk', 'email': 'bulk@yamdb.fake'
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что имя `bulk` занято путём эндпоинта и недоступно '
+            'при регистрации.'
+        )
+        response = admin_client.post('/api/v1/users/', data={
+            'username': 'bulk', 'email': 'bulk@yamdb.fake'
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что администратор не может создать пользователя '
+            '`bulk`.'
+        )
+        response = admin_client.post(self.BULK_URL, data=[
+            {'username': 'bulk', 'email': 'bulk@yamdb.fake'}
+        ], format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
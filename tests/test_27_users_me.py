@@ -0,0 +1,57 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27UsersMe:
+
+    USERS_ME_URL = '/api/v1/users/me/'
+
+    def request(self, client, method, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(client, method)(self.USERS_ME_URL, data=data)
+        assert response.status_code == HTTPStatus.OK
+        return response, [query['sql'] for query in queries.captured_queries]
+
+    def test_01_get(self, user_client, user):
+        response, queries = self.request(user_client, 'get')
+        assert response.json()['username'] == user.username
+        assert len(queries) == 1, (
+            f'Проверьте, что GET-запрос к `{self.USERS_ME_URL}` не '
+            'загружает пользователя повторно: достаточно запроса '
+            'аутентификации.'
+        )
+
+    def test_02_patch(self, user_client, user):
+        response, queries = self.request(
+            user_client, 'patch', {'bio': 'Обо мне'}
+        )
+        assert response.json()['bio'] == 'Обо мне'
+        updates = [sql for sql in queries if sql.startswith('UPDATE')]
+        assert len(queries) == 2 and len(updates) == 1, (
+            f'Проверьте, что PATCH-запрос к `{self.USERS_ME_URL}` выполняет '
+            'один UPDATE без повторной загрузки пользователя.'
+        )
+        assert '"bio"' in updates[0] and '"email"' not in updates[0], (
+            'Проверьте, что PATCH-запрос записывает только изменённые поля.'
+        )
+        user.refresh_from_db()
+        assert user.bio == 'Обо мне'
+
+        _, queries = self.request(user_client, 'patch', {'bio': 'Обо мне'})
+        assert len(queries) == 1, (
+            'Проверьте, что PATCH-запрос без изменений не пишет в базу.'
+        )
+
+    def test_03_patch_username(self, user_client, user, django_user_model):
+        response, queries = self.request(
+            user_client, 'patch', {'username': 'NewName', 'role': 'admin'}
+        )
+        assert response.json()['role'] == user.role, (
+            'Проверьте, что пользователь не может изменить свою роль.'
+        )
+        user = django_user_model.objects.get(id=user.id)
+        assert (user.username, user.username_lower) == ('NewName', 'newname')
@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def make_request(user, method='PATCH'):
+    return SimpleNamespace(user=user, method=method)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28Permissions:
+
+    @pytest.fixture
+    def staff(self, django_user_model):
+        return django_user_model.objects.create_user(
+            username='TestStaff', email='teststaff@yamdb.fake',
+            role='user', is_staff=True
+        )
+
+    def test_01_admin_only(self, user, moderator, admin, user_superuser,
+                           staff):
+        from api.core.permissions import AdminOnly
+
+        permission = AdminOnly()
+        expected = {
+            user: False, moderator: False, admin: True,
+            user_superuser: True, staff: True,
+        }
+        for person, allowed in expected.items():
+            request = make_request(person)
+            assert permission.has_permission(request, None) is allowed, (
+                f'Проверьте права администратора для роли {person.role}, '
+                f'is_superuser={person.is_superuser}, '
+                f'is_staff={person.is_staff}.'
+            )
+            assert permission.has_object_permission(
+                request, None, None
+            ) is allowed
+        assert permission.has_permission(make_request(None), None) is False
+
+    def test_02_author_or_staff(self, admin_client, user, moderator, admin,
+                                user_superuser, staff):
+        from api.core.permissions import IsAuthorOrModeratorOrAdmin
+        from reviews.models import Review
+        from tests.utils import create_titles
+
+        titles, _, _ = create_titles(admin_client)
+        Review.objects.create(
+            title_id=titles[0]['id'], author=user, text='Отзыв', score=5
+        )
+        review = Review.objects.get(author=user)
+        permission = IsAuthorOrModeratorOrAdmin()
+        expected = {
+            user: True, moderator: True, admin: True,
+            user_superuser: False, staff: False,
+        }
+        with CaptureQueriesContext(connection) as queries:
+            for person, allowed in expected.items():
+                assert permission.has_object_permission(
+                    make_request(person), None, review
+                ) is allowed, (
+                    f'Проверьте права на изменение чужого отзыва для роли '
+                    f'{person.role}.'
+                )
+                assert permission.has_object_permission(
+                    make_request(person, 'GET'), None, review
+                )
+        assert not queries.captured_queries, (
+            'Проверьте, что проверка прав на объект не загружает автора.'
+        )
+
+    def test_03_mask_cached(self, admin):
+        from api.core.permissions import AdminOnly
+
+        request = make_request(admin)
+        AdminOnly().has_permission(request, None)
+        request.user = None
+        assert AdminOnly().has_object_permission(request, None, None), (
+            'Проверьте, что маска ролей вычисляется один раз на запрос.'
+        )
@@ -0,0 +1,136 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29ModerationBulk:
+
+    REVIEWS_URL = '/api/v1/reviews/bulk/delete/'
+    COMMENTS_URL = '/api/v1/comments/bulk/delete/'
+
+    @pytest.fixture
+    def spam(self, django_user_model, user):
+        from reviews.models import Category, Comment, Review, Title
+
+        spammer = django_user_model.objects.create(
+            username='spammer', email='spammer@yamdb.fake'
+        )
+        category = Category.objects.create(name='Фильмы', slug='films')
+        titles = [
+            Title.objects.create(name=f'Фильм {i}', year=2000,
+                                 category=category)
+            for i in range(3)
+        ]
+        for title in titles:
+            Review.objects.create(title=title, author=user, text='Отзыв',
+                                  score=8)
+            review = Review.objects.create(title=title, author=spammer,
+                                           text='Спам', score=1)
+            Comment.objects.create(review=review, author=user, text='Ответ')
+            Comment.objects.create(review=title.reviews.get(author=user),
+                                   author=spammer, text='Спам')
+        Review.objects.update_comment_counts()
+        return spammer, titles
+
+    def test_01_reviews_by_author(self, moderator_client, spam):
+        from reviews.models import Comment, Review, Title
+
+        spammer, titles = spam
+        with CaptureQueriesContext(connection) as queries:
+            response = moderator_client.post(
+                self.REVIEWS_URL, data={'author': spammer.username},
+                format='json'
+            )
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что POST-запрос модератора к `{self.REVIEWS_URL}` '
+            'возвращает ответ со статусом 200.'
+        )
+        assert response.json() == {'deleted': 3}
+        assert not Review.objects.filter(author=spammer).exists()
+        assert Comment.objects.count() == 3, (
+            'Проверьте, что вместе с отзывами удаляются комментарии к ним.'
+        )
+        for title in Title.objects.filter(id__in=[t.id for t in titles]):
+            assert (title.rating, title.review_count) == (8, 1), (
+                'Проверьте, что после массового удаления отзывов рейтинг '
+                'произведений пересчитывается.'
+            )
+        updates = [
+            query for query in queries.captured_queries
+            if query['sql'].startswith('UPDATE "reviews_review"')
+        ]
+        assert len(updates) == 1, (
+            'Проверьте, что отзывы помечаются удалёнными одним запросом.'
+        )
+        rating_updates = [
+            query for query in queries.captured_queries
+            if query['sql'].startswith('UPDATE "reviews_title"')
+        ]
+        assert len(rating_updates) == 1, (
+            'Проверьте, что рейтинги пересчитываются один раз на запрос.'
+        )
+
+    def test_02_comments_by_ids(self, moderator_client, spam):
+        from reviews.models import Comment, Review
+
+        spammer, _ = spam
+        ids = list(Comment.objects.filter(
+            author=spammer
+        ).values_list('id', flat=True))
+        response = moderator_client.post(
+            self.COMMENTS_URL, data={'ids': ids[:2] + [10 ** 6]},
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {'deleted': 2}
+        assert list(Comment.objects.filter(
+            author=spammer
+        ).values_list('id', flat=True)) == ids[2:]
+        for review in Review.objects.all():
+            assert review.comment_count == review.comments.count(), (
+                'Проверьте, что после массового удаления комментариев '
+                'пересчитывается их число у отзывов.'
+            )
+
+    def test_03_access_and_validation(self, user_client, moderator_client,
+                                      admin_client, spam):
+        from reviews.models import Review
+
+        spammer, _ = spam
+        for url in (self.REVIEWS_URL, self.COMMENTS_URL):
+            response = user_client.post(
+                url, data={'author': spammer.username}, format='json'
+            )
+            assert response.status_code == HTTPStatus.FORBIDDEN, (
+                f'Проверьте, что `{url}` недоступен обычному пользователю.'
+            )
+            response = moderator_client.post(url, data={}, format='json')
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что `{url}` требует автора или список id.'
+            )
+        assert Review.objects.count() == 6
+
+        ids = list(Review.objects.values_list('id', flat=True))
+        response = admin_client.post(self.REVIEWS_URL, data={
+            'author': spammer.username, 'ids': ids
+        }, format='json')
+        assert response.json() == {'deleted': 3}, (
+            'Проверьте, что автор и список id можно указать вместе.'
+        )
+
+    def test_04_only_post(self, moderator_client, spam):
+        from reviews.models import Review
+
+        for url in (self.REVIEWS_URL, self.COMMENTS_URL):
+            for method in ('get', 'delete'):
+                response = getattr(moderator_client, method)(url)
+                assert response.status_code == (
+                    HTTPStatus.METHOD_NOT_ALLOWED
+                ), (
+                    f'Проверьте, что `{url}` принимает только POST-запросы, '
+                    f'а {method.upper()} возвращает ответ со статусом 405.'
+                )
+        assert Review.objects.count() == 6
@@ -0,0 +1,122 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30SoftDelete:
+
+    @pytest.fixture
+    def review(self, user_client, moderator):
+        from reviews.models import Category, Review, Title
+
+        category = Category.objects.create(name='Книги', slug='books')
+        title = Title.objects.create(name='Книга', year=2000,
+                                     category=category)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        user_client.post(url, data={'text': 'Отзыв', 'score': 4})
+        Review.objects.create(title=title, author=moderator, text='Отзыв',
+                              score=10)
+        review = Review.objects.get(score=4)
+        for text in ('Первый', 'Второй'):
+            user_client.post(f'{url}{review.id}/comments/',
+                             data={'text': text})
+        return url, review
+
+    def test_01_review(self, user_client, review):
+        from reviews.models import Comment, Review, Title
+
+        url, instance = review
+        with CaptureQueriesContext(connection) as queries:
+            response = user_client.delete(f'{url}{instance.id}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert not any(
+            query['sql'].startswith('DELETE')
+            for query in queries.captured_queries
+        ), 'Проверьте, что при удалении отзыв только помечается удалённым.'
+        assert Review.all_objects.get(id=instance.id).is_deleted
+        assert not Comment.objects.filter(review_id=instance.id).exists(), (
+            'Проверьте, что комментарии удалённого отзыва скрыты.'
+        )
+        assert user_client.get(
+            f'{url}{instance.id}/'
+        ).status_code == HTTPStatus.NOT_FOUND
+        assert user_client.get(url).json()['count'] == 1, (
+            'Проверьте, что удалённые отзывы не попадают в список.'
+        )
+        title = Title.objects.get(id=instance.title_id)
+        assert (title.rating, title.review_count) == (10, 1), (
+            'Проверьте, что удалённый отзыв не учитывается в рейтинге.'
+        )
+        assert user_client.delete(
+            f'{url}{instance.id}/'
+        ).status_code == HTTPStatus.NOT_FOUND
+
+        response = user_client.post(url, data={'text': 'Снова', 'score': 6})
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что после удаления отзыва автор может написать '
+            'новый отзыв на то же произведение.'
+        )
+
+    def test_02_comment(self, user_client, review):
+        from reviews.models import Comment, Review
+
+        url, instance = review
+        comment = instance.comments.first()
+        comments_url = f'{url}{instance.id}/comments/'
+        response = user_client.delete(f'{comments_url}{comment.id}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert Comment.all_objects.get(id=comment.id).is_deleted
+        assert user_client.get(comments_url).json()['count'] == 1
+        assert Review.objects.get(id=instance.id).comment_count == 1, (
+            'Проверьте, что при удалении комментария уменьшается счётчик '
+            'комментариев отзыва.'
+        )
+
+    def test_03_purge(self, user_client, review):
+        from reviews.models import Comment, Review, Title
+
+        url, instance = review
+        other = Review.objects.exclude(id=instance.id).get()
+        user_client.delete(f'{url}{instance.id}/')
+        Comment.objects.create(review=other, author=other.author, text='x')
+        Comment.objects.filter(review=other).update(is_deleted=True)
+
+        out = StringIO()
+        call_command('purge_deleted', dry_run=True, stdout=out)
+        assert 'отзывов: 1, комментариев: 3' in out.getvalue()
+        assert Review.all_objects.count() == 2
+
+        rating = Title.objects.get(id=instance.title_id).rating
+        out = StringIO()
+        call_command('purge_deleted', batch_size=1, stdout=out)
+        assert 'Удалено отзывов: 1, комментариев: 3' in out.getvalue(), (
+            'Проверьте, что команда `purge_deleted` удаляет помеченные '
+            'отзывы и комментарии.'
+        )
+        assert list(Review.all_objects.values_list('id', flat=True)) == [
+            other.id
+        ]
+        assert not Comment.all_objects.exists()
+        assert Title.objects.get(id=instance.title_id).rating == rating, (
+            'Проверьте, что очистка не меняет рейтинг произведения.'
+        )
+
+    def test_04_partial_index(self, review):
+        _, instance = review
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'EXPLAIN QUERY PLAN SELECT id FROM reviews_review '
+                'WHERE title_id = %s AND NOT is_deleted '
+                'ORDER BY pub_date DESC',
+                [instance.title_id]
+            )
+            plan = ' '.join(str(row) for row in cursor.fetchall())
+        assert 'review_title_live_idx' in plan, (
+            'Проверьте, что список действующих отзывов произведения '
+            'читается по частичному индексу.'
+        )